@@ -0,0 +1,107 @@
+# benchmarks/serialization.py
+"""
+Payload size and serialization time: default FastAPI path vs lean path.
+
+    cd app && python -m benchmarks.serialization [rows]
+
+Default path = pydantic validation of each ORM row + jsonable_encoder +
+json.dumps (what JSONResponse with a response_model does).
+Lean path = column dict + orjson, optionally gzip-compressed.
+"""
+import gzip
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, date, timezone
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+
+from schemas.agents import ResumeOut
+from schemas.applications import ApplicationOut
+from services.response_service import dumps, row_to_dict, GZIP_LEVEL, GZIP_MIN_SIZE
+
+VOCABULARY = (
+    "designed shipped backend services python fastapi owned postgresql schema "
+    "built llm extraction pipelines mentored engineers scaled latency reduced "
+    "costs migrated kubernetes observability dashboards customers product team "
+    "led delivered reliable apis data models testing deployment on-call"
+).split()
+
+rng = random.Random(42)
+
+
+def text(words):
+    """Varied prose so gzip ratios are not flattering."""
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)) + "."
+
+
+def fake_resumes(n):
+    return [
+        SimpleNamespace(
+            id=i, user_id=1, version=1,
+            skills="Python, FastAPI, SQL, LangChain, PyTorch, Docker",
+            experience=text(300),
+            knowledge=text(80),
+            education="B.Tech Computer Science",
+            projects=text(200),
+            certifications="AWS Certified Developer"
+        )
+        for i in range(n)
+    ]
+
+
+def fake_applications(n):
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), user_id=1, resume_id=i + 1,
+            job_role="Backend Engineer", company_name="Acme",
+            company_description=text(50), job_digest=text(40),
+            job_description=text(700), final_date=date.today(),
+            status="draft", version=1,
+            applied_at=now, created_at=now, updated_at=now
+        )
+        for i in range(n)
+    ]
+
+
+def default_path(rows, schema):
+    models = [schema.model_validate(r, from_attributes=True) for r in rows]
+    return json.dumps(
+        jsonable_encoder(models), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def lean_path(rows, schema):
+    fields = list(schema.model_fields)
+    return b"[" + b",".join(dumps(row_to_dict(r, fields)) for r in rows) + b"]"
+
+
+def timeit(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def report(label, rows, schema):
+    t_default, body_default = timeit(default_path, rows, schema)
+    t_lean, body_lean = timeit(lean_path, rows, schema)
+    t_gzip, body_gzip = timeit(gzip.compress, body_lean, GZIP_LEVEL)
+
+    print(f"\n{label} ({len(rows)} rows)")
+    print(f"  default : {t_default * 1000:8.2f} ms  {len(body_default):>10,} bytes")
+    print(f"  orjson  : {t_lean * 1000:8.2f} ms  {len(body_lean):>10,} bytes  ({t_default / t_lean:.1f}x faster)")
+    print(f"  + gzip  : {(t_lean + t_gzip) * 1000:8.2f} ms  {len(body_gzip):>10,} bytes  "
+          f"({len(body_gzip) / len(body_lean):.0%} of raw, threshold {GZIP_MIN_SIZE} B)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    report("Resumes", fake_resumes(n), ResumeOut)
+    report("Applications", fake_applications(n), ApplicationOut)
@@ -0,0 +1,86 @@
+# benchmarks/worker_scaling.py
+"""
+Throughput of the CPU-bound request paths vs number of worker processes.
+
+    cd app && python -m benchmarks.worker_scaling [max_workers] [seconds]
+
+Each worker process runs one path in a tight loop for a fixed window, the
+way a uvicorn worker would under load: JWT decode (every authenticated
+request), bcrypt verify (login) and orjson serialization of an
+applications page. Efficiency is throughput(N) / (N * throughput(1));
+near 100% means adding workers adds capacity linearly. Results are only
+meaningful up to the number of physical cores.
+"""
+import os
+import sys
+import time
+from multiprocessing import get_context
+
+from schemas.applications import ApplicationOut
+from services.auth_service import create_access_token, decode_access_token, hash_password, verify_password
+from services.response_service import dumps, row_to_dict
+
+from benchmarks.serialization import fake_applications
+
+PAGE_ROWS = 50
+
+
+def _jwt_op():
+    token = create_access_token({"sub": "user42"})
+    return lambda: decode_access_token(token)
+
+
+def _bcrypt_op():
+    hashed = hash_password("correct horse battery staple")
+    return lambda: verify_password("correct horse battery staple", hashed)
+
+
+def _serialize_op():
+    rows = fake_applications(PAGE_ROWS)
+    fields = list(ApplicationOut.model_fields)
+    return lambda: b"[" + b",".join(dumps(row_to_dict(r, fields)) for r in rows) + b"]"
+
+
+PATHS = {
+    "jwt decode": _jwt_op,
+    "bcrypt verify": _bcrypt_op,
+    "orjson page": _serialize_op,
+}
+
+
+def _worker(args):
+    name, seconds, start_at = args
+    op = PATHS[name]()
+    # Start together so every process overlaps for the whole window
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    ops, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        op()
+        ops += 1
+    return ops
+
+
+def throughput(pool, name: str, workers: int, seconds: float) -> float:
+    start_at = time.time() + 0.5
+    counts = pool.map(_worker, [(name, seconds, start_at)] * workers, chunksize=1)
+    return sum(counts) / seconds
+
+
+if __name__ == "__main__":
+    cpus = os.cpu_count() or 1
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else cpus
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+
+    print(f"{cpus} CPUs, {seconds:g}s window per run")
+    # spawn, like uvicorn's workers: nothing inherited from this process
+    with get_context("spawn").Pool(max_workers) as pool:
+        for name in PATHS:
+            print(f"\n{name}")
+            base = None
+            for workers in range(1, max_workers + 1):
+                rate = throughput(pool, name, workers, seconds)
+                base = base or rate
+                print(f"  {workers:>2} workers: {rate:>12,.0f} ops/s  "
+                      f"{rate / base:5.2f}x  efficiency {rate / (base * workers):6.1%}")
@@ -0,0 +1,183 @@
+# explain_check.py
+"""
+Query-plan regression check for the hot read paths.
+
+    cd app && python -m db.explain_check                      # throwaway SQLite
+    cd app && python -m db.explain_check --database-url postgresql://.../applyr_explain
+
+Migrates an EMPTY database to head, seeds realistic volumes, refreshes
+planner statistics, then EXPLAINs each hot query and fails (exit 1) if
+any of them scans a table sequentially instead of using an index.
+tests/test_query_plans.py runs it against SQLite on every `pytest` run.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, insert, select, func, text
+from sqlalchemy.engine import Engine
+
+from db.models import Users, Resume
+from models.applications import Application
+from models.job_descriptions import JobDescription
+
+SEED_USERS = int(os.getenv("EXPLAIN_SEED_USERS", "5000"))
+RESUMES_PER_USER = 2
+APPLICATIONS_PER_USER = 20
+STATUSES = ["draft", "applied", "screened", "interviewed", "selected", "rejected"]
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -----------------------
+# Hot queries (mirror the ones the routes run)
+# -----------------------
+def hot_queries():
+    user_id, resume_id = 42, 84
+    return {
+        "get_current_user: user by username": (
+            "users", select(Users).where(Users.username == "user42")
+        ),
+        "get_all_resumes: resumes by user": (
+            "resumes", select(Resume).where(Resume.user_id == user_id)
+        ),
+        "list_my_resumes: ETag version probe": (
+            "resumes",
+            select(func.count(Resume.id), func.sum(Resume.id), func.sum(Resume.version))
+            .where(Resume.user_id == user_id)
+        ),
+        "fetch_resume: version by id": (
+            "resumes",
+            select(Resume.version).where(Resume.id == resume_id, Resume.user_id == user_id)
+        ),
+        "stream_applications: by user, newest first": (
+            "applications",
+            select(Application).where(Application.user_id == user_id)
+            .order_by(Application.applied_at.desc())
+        ),
+        "stream_applications: by user and status, newest first": (
+            "applications",
+            select(Application)
+            .where(Application.user_id == user_id, Application.status == "applied")
+            .order_by(Application.applied_at.desc())
+        ),
+        "load_job_description: by content hash": (
+            "job_descriptions",
+            select(JobDescription.body).where(JobDescription.content_hash == "0" * 64)
+        ),
+    }
+
+
+# -----------------------
+# Schema + seed data
+# -----------------------
+def migrate(url: str):
+    config = Config(os.path.join(APP_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(APP_DIR, "migrations"))
+    config.cmd_opts = argparse.Namespace(x=[f"url={url}"])
+    command.upgrade(config, "head")
+
+
+def seed(engine: Engine, users: int = SEED_USERS):
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    hashes = [f"{i:064x}" for i in range(users // 10 or 1)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Users), [
+            {"id": i, "username": f"user{i}", "password": "x", "name": f"User {i}", "mail": f"user{i}@example.com"}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(Resume), [
+            {"id": (i - 1) * RESUMES_PER_USER + r + 1, "user_id": i, "skills": "Python, SQL"}
+            for i in range(1, users + 1) for r in range(RESUMES_PER_USER)
+        ])
+        conn.execute(insert(JobDescription), [
+            {"content_hash": h, "body": b"x", "size": 1} for h in hashes
+        ])
+        conn.execute(insert(Application), [
+            {
+                "id": uuid.uuid4(),
+                "user_id": i,
+                "resume_id": (i - 1) * RESUMES_PER_USER + 1,
+                "job_role": "Engineer",
+                "job_description_hash": rng.choice(hashes),
+                "company_name": "Acme",
+                "status": rng.choice(STATUSES),
+                "applied_at": now - timedelta(days=rng.randint(0, 365)),
+            }
+            for i in range(1, users + 1) for _ in range(APPLICATIONS_PER_USER)
+        ])
+
+    # Planner statistics, so the plans reflect realistic selectivity
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+# -----------------------
+# Plan inspection
+# -----------------------
+def explain(engine: Engine, query) -> list:
+    """Return the list of sequential-scan findings for one query."""
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return _pg_seq_scans(plan[0]["Plan"])
+
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        # SQLite: "SCAN <table>" without "USING ... INDEX" is a full table scan
+        return [
+            row[-1] for row in rows
+            if row[-1].startswith("SCAN ") and "INDEX" not in row[-1]
+        ]
+
+
+def _pg_seq_scans(node: dict) -> list:
+    found = []
+    if node.get("Node Type") == "Seq Scan":
+        found.append(f"Seq Scan on {node.get('Relation Name')}")
+    for child in node.get("Plans", []):
+        found.extend(_pg_seq_scans(child))
+    return found
+
+
+def run(url: str) -> int:
+    migrate(url)
+    engine = create_engine(url)
+    seed(engine)
+
+    failures = 0
+    for name, (table, query) in hot_queries().items():
+        scans = [s for s in explain(engine, query) if table in s]
+        if scans:
+            failures += 1
+            print(f"✘ {name}: {', '.join(scans)}")
+        else:
+            print(f"✔ {name}")
+
+    print(f"\n{len(hot_queries()) - failures}/{len(hot_queries())} hot queries use indexes "
+          f"({engine.dialect.name}, {SEED_USERS} users seeded)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Assert hot queries use index scans.")
+    parser.add_argument("--database-url", help="EMPTY database to migrate and seed (default: temp SQLite)")
+    args = parser.parse_args()
+
+    if args.database_url:
+        sys.exit(run(args.database_url))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.exit(run(f"sqlite:///{os.path.join(tmp, 'explain.db')}"))
@@ -0,0 +1,224 @@
+# import_cohort.py
+"""
+Bulk-onboard a cohort of users (and optional resumes) from CSV or JSONL.
+
+    cd app && python -m db.import_cohort cohort.jsonl [--database-url URL] [--errors errors.jsonl]
+
+Each row needs username, password, name, mail and may carry job_role plus
+any resume field (skills, experience, knowledge, education, projects,
+certifications). Passwords are hashed across a process pool, uniqueness
+is checked with one set-based query per chunk, and rows are loaded with
+COPY on PostgreSQL or batched executemany elsewhere (e.g. SQLite in tests).
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.engine import Connection, Engine
+
+from db.models import Users, Resume
+from schemas.agents import ResumeCreate
+from schemas.users import UserCreate
+from services.auth_service import hash_password
+
+# Bind parameters per IN (...) probe; keeps SQLite under its variable limit
+LOOKUP_CHUNK = 500
+
+USER_COLUMNS = ["username", "password", "name", "job_role", "mail"]
+RESUME_COLUMNS = ["user_id", "skills", "experience", "knowledge", "education", "projects", "certifications"]
+
+
+# -----------------------
+# Reading + validation
+# -----------------------
+def read_rows(path: str) -> List[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            return list(csv.DictReader(f))
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _describe(error: ValidationError) -> str:
+    """Every failing field with its message, e.g. "mail: value is not a valid email address"."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def validate_rows(rows: List[dict], errors: List[dict]) -> List[Tuple[int, UserCreate, ResumeCreate]]:
+    """Pydantic validation plus duplicate detection within the file itself."""
+    valid, seen_usernames, seen_mails = [], set(), set()
+
+    for line, row in enumerate(rows, start=1):
+        row = {k: (v if v != "" else None) for k, v in row.items()}
+        try:
+            user = UserCreate(**{k: row.get(k) for k in USER_COLUMNS})
+            resume = ResumeCreate(**{k: row.get(k) for k in RESUME_COLUMNS if k != "user_id"})
+        except ValidationError as e:
+            errors.append({"row": line, "username": row.get("username"), "error": _describe(e)})
+            continue
+
+        if user.username in seen_usernames:
+            errors.append({"row": line, "username": user.username, "error": "Duplicate username in file"})
+            continue
+        if user.mail in seen_mails:
+            errors.append({"row": line, "username": user.username, "error": "Duplicate email in file"})
+            continue
+
+        seen_usernames.add(user.username)
+        seen_mails.add(user.mail)
+        valid.append((line, user, resume))
+
+    return valid
+
+
+def filter_existing(conn: Connection, valid: list, errors: List[dict]) -> list:
+    """Drop rows whose username or mail already exists, one query per chunk."""
+    taken_usernames, taken_mails = set(), set()
+
+    for i in range(0, len(valid), LOOKUP_CHUNK):
+        chunk = valid[i:i + LOOKUP_CHUNK]
+        result = conn.execute(
+            select(Users.username, Users.mail).where(or_(
+                Users.username.in_([u.username for _, u, _ in chunk]),
+                Users.mail.in_([u.mail for _, u, _ in chunk])
+            ))
+        )
+        for username, mail in result:
+            taken_usernames.add(username)
+            taken_mails.add(mail)
+
+    kept = []
+    for line, user, resume in valid:
+        if user.username in taken_usernames:
+            errors.append({"row": line, "username": user.username, "error": "Username already registered"})
+        elif user.mail in taken_mails:
+            errors.append({"row": line, "username": user.username, "error": "Email already registered"})
+        else:
+            kept.append((line, user, resume))
+    return kept
+
+
+# -----------------------
+# Loading
+# -----------------------
+def _copy(conn: Connection, table: str, columns: List[str], records: List[dict]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(["\\N" if record[c] is None else record[c] for c in columns])
+    buffer.seek(0)
+
+    cursor = conn.connection.driver_connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        buffer
+    )
+
+
+def load_rows(conn: Connection, users: List[dict], resumes_by_username: Dict[str, dict]):
+    if conn.dialect.name == "postgresql":
+        _copy(conn, Users.__tablename__, USER_COLUMNS, users)
+    else:
+        conn.execute(insert(Users), users)
+
+    # Resolve the new ids in one pass per chunk to attach resumes
+    usernames = list(resumes_by_username)
+    resumes = []
+    for i in range(0, len(usernames), LOOKUP_CHUNK):
+        result = conn.execute(
+            select(Users.id, Users.username).where(Users.username.in_(usernames[i:i + LOOKUP_CHUNK]))
+        )
+        for user_id, username in result:
+            resumes.append({"user_id": user_id, **resumes_by_username[username]})
+
+    if not resumes:
+        return 0
+    if conn.dialect.name == "postgresql":
+        _copy(conn, Resume.__tablename__, RESUME_COLUMNS, resumes)
+    else:
+        conn.execute(insert(Resume), resumes)
+    return len(resumes)
+
+
+def import_cohort(path: str, engine: Engine, workers: int = None) -> dict:
+    errors: List[dict] = []
+    started = time.perf_counter()
+
+    valid = validate_rows(read_rows(path), errors)
+
+    with engine.connect() as conn:
+        valid = filter_existing(conn, valid, errors)
+
+    # bcrypt dominates; spread it across cores, outside any transaction
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = list(pool.map(
+            hash_password,
+            [u.password for _, u, _ in valid],
+            chunksize=max(1, len(valid) // (workers * 4))
+        ))
+
+    users, resumes_by_username = [], {}
+    for (_, user, resume), hashed in zip(valid, hashes):
+        users.append({
+            "username": user.username,
+            "password": hashed,
+            "name": user.name,
+            "job_role": user.job_role,
+            "mail": user.mail
+        })
+        fields = resume.dict()
+        if any(fields.values()):
+            resumes_by_username[user.username] = fields
+
+    # All-or-nothing load; a unique violation from a concurrent signup rolls back
+    resume_count = 0
+    if users:
+        with engine.begin() as conn:
+            resume_count = load_rows(conn, users, resumes_by_username)
+
+    return {
+        "users_created": len(users),
+        "resumes_created": resume_count,
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import a cohort of users and resumes.")
+    parser.add_argument("path", help="CSV or JSONL file")
+    parser.add_argument("--database-url", help="Defaults to the app database")
+    parser.add_argument("--workers", type=int, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--errors", help="Write per-row errors to this JSONL file")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        from db.database import engine
+
+    summary = import_cohort(args.path, engine, args.workers)
+
+    print(f"✔ {summary['users_created']} users, {summary['resumes_created']} resumes "
+          f"in {summary['seconds']}s")
+    if summary["errors"]:
+        print(f"⚠ {len(summary['errors'])} rows rejected")
+        if args.errors:
+            with open(args.errors, "w") as f:
+                for error in summary["errors"]:
+                    f.write(json.dumps(error) + "\n")
+        else:
+            for error in summary["errors"]:
+                print(f"  row {error['row']} ({error['username']}): {error['error']}")
+
+    sys.exit(1 if summary["errors"] else 0)
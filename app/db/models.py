@@ -14,6 +14,9 @@ class Users(Base):
     job_role = Column(String(255))
     mail = Column(String(255), unique=True, nullable=False)
 
+    # Bumped by update_own_profile; drives ETags on /me
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # FIX: specify correct FK for relationship
     resumes = relationship(
         "Resume",
@@ -29,7 +32,7 @@ class Resume(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # ❗ KEEP ONLY THIS FOREIGN KEY
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # DO NOT KEEP THIS:
     # username = Column(String(255), ForeignKey("users.username"))  <-- REMOVE
@@ -42,6 +45,9 @@ class Resume(Base):
     projects = Column(Text)
     certifications = Column(Text)
 
+    # Bumped by update_resume; drives resume ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     user = relationship(
         "Users",
         back_populates="resumes",
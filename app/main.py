@@ -1,21 +1,69 @@
-from fastapi import FastAPI
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 #from database.database import engine, Base
-from routes import auth, agents, users
+from routes import auth, agents, users, admin, applications
 import uvicorn
-from db.database import engine
-from db.models import Users, Resume
+from db.database import dispose_engines
+from services.agent_service import init_agent_clients, close_agent_clients
+from services.application_service import init_extraction_clients, close_extraction_clients
+from services.posting_cleaner_service import shutdown_pool
+from services.metrics_service import (
+    REQUEST_LATENCY,
+    start_request_timings,
+    format_server_timing,
+    render_metrics,
+    mark_worker_dead
+)
+from services.response_service import GZIP_MIN_SIZE, GZIP_LEVEL
+from services.profiling_service import (
+    PROFILE_HEADER,
+    PROFILE_SCOPE,
+    SamplingProfiler,
+    should_profile,
+    save_profile
+)
+
 
 
+# Seconds a worker gets to finish in-flight requests on SIGTERM
+GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+
 
 # Create database tables
 #Base.metadata.create_all(bind=engine)
 
+# Each worker builds its own clients after it starts and tears them down
+# on shutdown; nothing holding a socket is created at import time.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_agent_clients()
+    init_extraction_clients()
+    try:
+        yield
+    finally:
+        close_agent_clients()
+        close_extraction_clients()
+        shutdown_pool()
+        await dispose_engines()
+        mark_worker_dead()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Agent-Based Application API",
     description="A FastAPI backend for agent-based applications with authentication",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -25,14 +73,64 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Applyr-Profile-Id", "X-Applyr-Profile-Scope"],
 )
 
-Users.metadata.create_all(bind=engine)
-Resume.metadata.create_all(bind=engine)
+# Compress anything above the threshold (large Text fields compress well)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+
+# Per-request latency + Server-Timing breakdown for the extension devtools
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    timings = start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    REQUEST_LATENCY.labels(
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code
+    ).observe(total)
+
+    response.headers["Server-Timing"] = format_server_timing(timings, total)
+    return response
+
+
+# Opt-in sampling profiler (admin header or PROFILING_SAMPLE_RATE)
+@app.middleware("http")
+async def request_profiler(request: Request, call_next):
+    if not should_profile(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+
+    profiler = SamplingProfiler()
+    profiler.start()
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+
+    # File write + retention sweep stay off the event loop
+    name = await run_in_threadpool(
+        save_profile, profiler, request.method, request.url.path, time.perf_counter() - start
+    )
+    if name:
+        response.headers["X-Applyr-Profile-Id"] = name
+        response.headers["X-Applyr-Profile-Scope"] = PROFILE_SCOPE
+    return response
+
+
+# Schema is managed by Alembic: `cd app && alembic upgrade head`
+# (databases created by the old create_all: `alembic stamp 0001` first)
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(users.user_router, prefix="/api/users", tags=["users"])
 app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
+app.include_router(applications.router, prefix="/api/applications", tags=["applications"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 # app.include_router(tools.router, prefix="/api/tools", tags=["tools"])
 
 @app.get("/")
@@ -43,8 +141,40 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "agent-api"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the Applyr API.")
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+        help="Worker processes (default: WEB_CONCURRENCY or 1)"
+    )
+    args = parser.parse_args()
+
+    # Workers must share a metrics directory, set before they import
+    # prometheus_client, and it must start empty on every boot
+    multiproc_dir = None
+    if args.workers > 1 and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiproc_dir = tempfile.mkdtemp(prefix="applyr-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+
+    try:
+        # app/ is not a package: import "main" with app/ on the path, from
+        # any working directory and in every spawned worker
+        uvicorn.run(
+            "main:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        )
+    finally:
+        if multiproc_dir:
+            shutil.rmtree(multiproc_dir, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,60 @@
+# migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from db.database import Base, SQLALCHEMY_DATABASE_URL
+
+# Register every table on Base.metadata for autogenerate
+import db.models  # noqa: F401
+import models.applications  # noqa: F401
+import models.job_descriptions  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Precedence: -x url=..., then alembic.ini, then the app database
+url = context.get_x_argument(as_dictionary=True).get("url") \
+    or config.get_main_option("sqlalchemy.url") \
+    or SQLALCHEMY_DATABASE_URL
+config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER most things in place
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
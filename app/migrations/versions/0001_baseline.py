@@ -0,0 +1,48 @@
+"""baseline: users and resumes as created by create_all
+
+Existing databases already have these tables; mark them with
+`alembic stamp 0001` instead of upgrading through this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("username", sa.String(255), nullable=False, unique=True),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("job_role", sa.String(255)),
+        sa.Column("mail", sa.String(255), nullable=False, unique=True),
+    )
+
+    op.create_table(
+        "resumes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("skills", sa.Text()),
+        sa.Column("experience", sa.Text()),
+        sa.Column("knowledge", sa.Text()),
+        sa.Column("education", sa.Text()),
+        sa.Column("projects", sa.Text()),
+        sa.Column("certifications", sa.Text()),
+    )
+    op.create_index("ix_resumes_id", "resumes", ["id"])
+
+
+def downgrade():
+    op.drop_index("ix_resumes_id", table_name="resumes")
+    op.drop_table("resumes")
+    op.drop_table("users")
@@ -0,0 +1,73 @@
+"""version columns, job_descriptions store and applications
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch:
+        batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+    with op.batch_alter_table("resumes") as batch:
+        batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+    op.create_table(
+        "job_descriptions",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    op.create_table(
+        "applications",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="cascade"), nullable=False),
+        sa.Column("resume_id", sa.Integer(), sa.ForeignKey("resumes.id", ondelete="set null"), nullable=True),
+        sa.Column("job_role", sa.Text(), nullable=False),
+        sa.Column(
+            "job_description_hash",
+            sa.String(64),
+            sa.ForeignKey("job_descriptions.content_hash"),
+            nullable=False
+        ),
+        sa.Column("company_name", sa.Text(), nullable=False),
+        sa.Column("company_description", sa.Text(), nullable=True),
+        sa.Column("job_digest", sa.Text(), nullable=True),
+        sa.Column("final_date", sa.Date(), nullable=True),
+        sa.Column("response", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("applied_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.CheckConstraint(
+            "status NOT IN ('applied', 'screened', 'interviewed', 'selected', 'rejected') OR resume_id IS NOT NULL",
+            name="resume_required_for_applied"
+        ),
+    )
+    op.create_index("ix_applications_resume_id", "applications", ["resume_id"])
+    op.create_index("ix_applications_job_description_hash", "applications", ["job_description_hash"])
+
+
+def downgrade():
+    op.drop_index("ix_applications_job_description_hash", table_name="applications")
+    op.drop_index("ix_applications_resume_id", table_name="applications")
+    op.drop_table("applications")
+    op.drop_table("job_descriptions")
+
+    with op.batch_alter_table("resumes") as batch:
+        batch.drop_column("version")
+
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("version")
@@ -0,0 +1,38 @@
+"""composite indexes for the hot read paths
+
+users.username already has the unique index behind get_current_user.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # get_all_resumes, the resume-list ETag probe
+    op.create_index("ix_resumes_user_id", "resumes", ["user_id"])
+
+    # Application lists, with and without a status filter, newest first
+    op.create_index(
+        "ix_applications_user_status_applied",
+        "applications",
+        ["user_id", "status", "applied_at"]
+    )
+    op.create_index(
+        "ix_applications_user_applied",
+        "applications",
+        ["user_id", "applied_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_applications_user_applied", table_name="applications")
+    op.drop_index("ix_applications_user_status_applied", table_name="applications")
+    op.drop_index("ix_resumes_user_id", table_name="resumes")
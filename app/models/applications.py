@@ -1,5 +1,6 @@
 import uuid
 from sqlalchemy import (
+    Index,
     Column,
     Text,
     String,
@@ -8,9 +9,10 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     func,
-    CheckConstraint
+    Integer,
+    CheckConstraint,
+    Uuid
 )
-from sqlalchemy.dialects.postgresql import UUID
 from db.database import Base
 
 
@@ -18,22 +20,21 @@ class Application(Base):
     __tablename__ = "applications"
 
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4
     )
 
-    # Ownership
+    # Ownership (users.id / resumes.id are integers)
     user_id = Column(
-        UUID(as_uuid=True),
+        Integer,
         ForeignKey("users.id", ondelete="cascade"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     # Resume may not exist at creation time
     resume_id = Column(
-        UUID(as_uuid=True),
+        Integer,
         ForeignKey("resumes.id", ondelete="set null"),
         nullable=True,
         index=True
@@ -41,10 +42,19 @@ class Application(Base):
 
     # Extracted fields (LLM)
     job_role = Column(Text, nullable=False)
-    job_description = Column(Text, nullable=False)
+    # Body lives in job_descriptions, shared across applications
+    job_description_hash = Column(
+        String(64),
+        ForeignKey("job_descriptions.content_hash"),
+        nullable=False,
+        index=True
+    )
     company_name = Column(Text, nullable=False)
     company_description = Column(Text, nullable=True)
 
+    # Compact role/requirements/company summary injected into answer prompts
+    job_digest = Column(Text, nullable=True)
+
     # Deadlines
     final_date = Column(Date, nullable=True)
 
@@ -58,6 +68,14 @@ class Application(Base):
         default="draft"
     )
 
+    # Optimistic concurrency: bumped on every status change
+    version = Column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default="1"
+    )
+
     # Timestamps
     applied_at = Column(
         DateTime(timezone=True),
@@ -80,4 +98,8 @@ class Application(Base):
             "status NOT IN ('applied', 'screened', 'interviewed', 'selected', 'rejected') OR resume_id IS NOT NULL",
             name="resume_required_for_applied"
         ),
+        # Status-filtered lists: WHERE user_id = ? AND status = ? ORDER BY applied_at
+        Index("ix_applications_user_status_applied", "user_id", "status", "applied_at"),
+        # Unfiltered lists: WHERE user_id = ? ORDER BY applied_at DESC
+        Index("ix_applications_user_applied", "user_id", "applied_at"),
     )
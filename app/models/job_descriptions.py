@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    LargeBinary,
+    DateTime,
+    func
+)
+from db.database import Base
+
+
+class JobDescription(Base):
+    """
+    Content-addressed job description bodies, shared by every application
+    to the same posting. Keyed by the sha256 of the normalized text and
+    stored zlib-compressed.
+    """
+    __tablename__ = "job_descriptions"
+
+    content_hash = Column(String(64), primary_key=True)
+
+    # zlib-compressed UTF-8 of the first copy seen, formatting intact
+    body = Column(LargeBinary, nullable=False)
+
+    # Uncompressed length in characters
+    size = Column(Integer, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
@@ -0,0 +1,37 @@
+# routes/admin.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from services.profiling_service import PROFILE_SCOPE, is_admin_token, list_profiles, profile_path
+
+router = APIRouter()
+
+
+# -----------------------
+# Admin guard (shared token from env)
+# -----------------------
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+# -----------------------
+# Stored request profiles
+# -----------------------
+@router.get("/profiles", dependencies=[Depends(require_admin)])
+def get_profiles():
+    return list_profiles()
+
+
+@router.get("/profiles/{name}", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+def get_profile(name: str):
+    """Collapsed stacks; render with flamegraph.pl or drop into speedscope.app."""
+    path = profile_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    with open(path) as f:
+        return PlainTextResponse(f.read(), headers={"X-Applyr-Profile-Scope": PROFILE_SCOPE})
@@ -2,22 +2,28 @@
 import asyncio
 from fastapi import APIRouter, HTTPException
 from pydantic import ValidationError
-from typing import List, Dict, Union
-from services.agent_service import answer_sql_questions
+from typing import List, Dict, Union, Optional
+from services.agent_service import answer_sql_questions, load_answer_resume
+from services.application_service import get_job_digest
 from schemas.agents import ResumeCreate, ResumeOut, ResumeUpdate, QuestionRequest
 from services.agent_service import (
     create_resume,
     get_resume,
     get_all_resumes,
+    get_resume_version,
+    get_resume_list_version,
     update_resume,
     delete_resume
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from db.database import get_db
+from db.database import get_db, get_async_db
 from db.models import Users
-from routes.auth import get_current_user
-from fastapi import APIRouter, Depends, HTTPException
+from routes.auth import get_current_user, get_current_user_async
+from services.metrics_service import track_stage, record_retry
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from services.etag_service import make_etag, etag_matches, not_modified, set_etag
 
 
 router = APIRouter()
@@ -42,13 +48,19 @@ async def retry_call(func, retries=3, delay=1.0, *args, **kwargs):
             if attempt == retries:
                 raise  # rethrow final error
 
-            await asyncio.sleep(delay)
+            record_retry(func.__name__)
+            with track_stage("retry.backoff"):
+                await asyncio.sleep(delay)
             delay *= 2  # exponential backoff
 
 
 
 @router.post("/answer_question")
-async def answer_question(payload: QuestionRequest) -> Dict[str, Union[bool, Dict, str]]:
+async def answer_question(
+    payload: QuestionRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user_async)
+) -> Dict[str, Union[bool, Dict, str]]:
     """API endpoint to answer resume/job questions using SQL + LLM tool-calling with retries."""
 
     try:
@@ -65,15 +77,30 @@ async def answer_question(payload: QuestionRequest) -> Dict[str, Union[bool, Dic
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    job_context = None
+    if payload.application_id:
+        with track_stage("agents.job_digest_lookup"):
+            job_context = await get_job_digest(db, current_user.id, payload.application_id)
+
+    with track_stage("agents.resume_lookup"):
+        resume = await load_answer_resume(db, current_user.id, payload.resume_id)
+
+    # Auth, digest and resume all ran on this one async session; loaded
+    # rows stay usable, so give its connection back before the LLM calls
+    await db.close()
+
     try:
-        result = await asyncio.wait_for(
-            retry_call(
-                answer_sql_questions,
-                user_id=payload.user_id,
-                questions=questions_text
-            ),
-            timeout=30  # global timeout for entire operation
-        )
+        with track_stage("agents.answer_question"):
+            result = await asyncio.wait_for(
+                retry_call(
+                    answer_sql_questions,
+                    user_id=current_user.id,
+                    questions=questions_text,
+                    job_context=job_context,
+                    resume=resume
+                ),
+                timeout=30  # global timeout for entire operation
+            )
 
         return {
             "success": True,
@@ -105,18 +132,32 @@ def create_new_resume(
 
 @router.get("/", response_model=List[ResumeOut])
 def list_my_resumes(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user)
 ):
+    etag = make_etag("resumes", current_user.id, *get_resume_list_version(db, current_user))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return get_all_resumes(db, current_user)
 
 
 @router.get("/{resume_id}", response_model=ResumeOut)
 def fetch_resume(
     resume_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: Users = Depends(get_current_user)
 ):
+    etag = make_etag("resume", resume_id, get_resume_version(db, resume_id, current_user))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return get_resume(db, resume_id, current_user)
 
 
@@ -0,0 +1,55 @@
+# routes/applications.py
+
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.database import get_async_db
+from db.models import Users
+from routes.auth import get_current_user
+from schemas.applications import ApplicationOut, BulkStatusUpdate, StatusTransitionResult
+from services.application_service import bulk_transition_status, stream_applications
+from services.response_service import stream_json_array, row_to_dict
+
+router = APIRouter()
+
+# Description comes from job_descriptions, not from the Application row
+APPLICATION_COLUMNS = [f for f in ApplicationOut.model_fields if f != "job_description"]
+
+
+def serialize_application(row) -> dict:
+    application, description = row
+    data = row_to_dict(application, APPLICATION_COLUMNS)
+    data["job_description"] = description
+    return data
+
+
+# -----------------------
+# List own applications (streamed row by row)
+# -----------------------
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[ApplicationOut]}}
+)
+async def list_my_applications(
+    include_description: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user)
+):
+    rows = stream_applications(db, current_user.id, include_description)
+    return stream_json_array(rows, serialize_application)
+
+
+# -----------------------
+# Bulk status transitions (one round trip for N rows)
+# -----------------------
+@router.patch("/status", response_model=List[StatusTransitionResult])
+async def update_statuses(
+    payload: BulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Users = Depends(get_current_user)
+):
+    return await bulk_transition_status(db, current_user.id, payload.transitions)
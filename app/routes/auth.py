@@ -1,10 +1,12 @@
 # routes/users_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from db.database import get_db
+from db.database import get_db, get_async_db
 from db.models import Users
 from schemas.users import UserCreate, UserOut, UserUpdate, TokenResponse, UserLogin
 from services.auth_service import (
@@ -14,6 +16,8 @@ from services.auth_service import (
     decode_access_token,
     auth_scheme
 )
+from services.metrics_service import track_stage
+from services.etag_service import make_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
@@ -21,20 +25,46 @@ router = APIRouter()
 # -----------------------
 # Extract current user from Bearer Token
 # -----------------------
-def get_current_user(
-    credentials=Depends(auth_scheme),
-    db: Session = Depends(get_db)
-):
+def _token_username(credentials) -> str:
     raw = credentials.credentials
     token = raw.replace("Bearer ", "").strip()  # FIX HERE
 
-    payload = decode_access_token(token)
+    with track_stage("auth.decode_token"):
+        payload = decode_access_token(token)
     username = payload.get("sub")
 
     if not username:
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    return username
+
+
+def get_current_user(
+    credentials=Depends(auth_scheme),
+    db: Session = Depends(get_db)
+):
+    username = _token_username(credentials)
+
+    with track_stage("auth.user_lookup"):
+        user = db.query(Users).filter(Users.username == username).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return user
 
-    user = db.query(Users).filter(Users.username == username).first()
+
+async def get_current_user_async(
+    credentials=Depends(auth_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Same lookup on the request's async session, for long-running async
+    routes: no sync connection is checked out, and the route can release
+    the shared session's connection once its own reads are done.
+    """
+    username = _token_username(credentials)
+
+    with track_stage("auth.user_lookup"):
+        user = await db.scalar(select(Users).where(Users.username == username))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -53,9 +83,12 @@ def register_user(payload: UserCreate, db: Session = Depends(get_db)):
     if db.query(Users).filter(Users.mail == payload.mail).first():
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    with track_stage("auth.hash_password"):
+        hashed = hash_password(payload.password)
+
     user = Users(
         username=payload.username,
-        password=hash_password(payload.password),
+        password=hashed,
         name=payload.name,
         job_role=payload.job_role,
         mail=payload.mail
@@ -74,7 +107,10 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
 
     user = db.query(Users).filter(Users.username == payload.username).first()
 
-    if not user or not verify_password(payload.password, user.password):
+    with track_stage("auth.verify_password"):
+        valid = user is not None and verify_password(payload.password, user.password)
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
     token = create_access_token({"sub": user.username})
@@ -86,7 +122,17 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
 # Get own profile
 # -----------------------
 @router.get("/me", response_model=UserOut)
-def read_own_profile(current_user: Users = Depends(get_current_user)):
+def read_own_profile(
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: Users = Depends(get_current_user)
+):
+    # Row is already loaded for auth, so the version costs nothing extra
+    etag = make_etag("me", current_user.id, current_user.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return current_user
 
 
@@ -116,6 +162,10 @@ def update_own_profile(
     if payload.password:
         user.password = hash_password(payload.password)
 
+    # In-SQL increment: concurrent writers both land, last write wins
+    if db.is_modified(user):
+        user.version = Users.version + 1
+
     db.add(user)
     db.commit()
     db.refresh(user)
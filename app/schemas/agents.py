@@ -1,13 +1,19 @@
 # schemas/resume.py
 from pydantic import BaseModel
 from typing import Optional, Union, List
+from uuid import UUID
 
 # =============================
 #   REQUEST MODEL
 # =============================
 class QuestionRequest(BaseModel):
-    user_id: str
+    # Ignored: answers are for the authenticated user. Kept for older clients.
+    user_id: Optional[str] = None
     questions: Union[str, List[str]]
+    # Stored resume to answer from (default: the user's newest)
+    resume_id: Optional[int] = None
+    # Application whose job digest should ground the answers
+    application_id: Optional[UUID] = None
 
 class ResumeBase(BaseModel):
     skills: Optional[str] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import date
+from typing import Optional, List
+from datetime import date, datetime
+from uuid import UUID
 
 class ApplicationExtract(BaseModel):
     job_role: str = Field(description="Job title or role")
@@ -11,3 +12,49 @@ class ApplicationExtract(BaseModel):
         default=None,
         description="Last application date if mentioned"
     )
+
+
+class ApplicationOut(BaseModel):
+    id: UUID
+    user_id: int
+    resume_id: Optional[int] = None
+    job_role: str
+    company_name: str
+    company_description: Optional[str] = None
+    job_digest: Optional[str] = None
+    job_description: Optional[str] = None
+    final_date: Optional[date] = None
+    status: str
+    version: int
+    applied_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+# =============================
+#   BULK STATUS TRANSITIONS
+# =============================
+class StatusTransition(BaseModel):
+    id: UUID
+    status: str
+    # Version the client last saw; the row is skipped if it has moved on
+    version: int
+    # One of the user's resumes to attach in the same update (required to
+    # leave draft when none is attached yet)
+    resume_id: Optional[int] = None
+
+
+class BulkStatusUpdate(BaseModel):
+    transitions: List[StatusTransition] = Field(min_length=1, max_length=500)
+
+
+class StatusTransitionResult(BaseModel):
+    id: UUID
+    ok: bool
+    status: Optional[str] = None
+    version: Optional[int] = None
+    resume_id: Optional[int] = None
+    error: Optional[str] = None
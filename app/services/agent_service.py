@@ -2,10 +2,11 @@
 import os
 import json
 import asyncio
-from typing import Dict
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_community.utilities import SQLDatabase
@@ -17,6 +18,15 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from db.models import Resume, Users
 from schemas.agents import ResumeCreate, ResumeUpdate
+from services.metrics_service import track_stage, record_llm_usage
+from services.prompt_service import (
+    ANSWER_PROMPT_TOKEN_BUDGET,
+    build_answer_messages,
+    build_sql_messages,
+    truncate_to_tokens
+)
+from services.retrieval_service import resume_indexes, resume_fields, resume_source
+from services.scheduler_service import llm_scheduler, INTERACTIVE
 
 import os
 from llama_cloud_services import LlamaExtract
@@ -27,70 +37,133 @@ from db.models import Resume, Users
 load_dotenv()
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("❌ GOOGLE_API_KEY missing in .env")
 
+DB_PATH = "./resumes.db"
 
+LLM_MODEL = "gemini-2.0-flash"
 
-initialize_database()
+# Per-process clients. Created by init_agent_clients() from each worker's
+# lifespan, never at import, so no sockets or pools cross a fork.
+llm = None
+engine = None
+sql_tools = None
+llm_with_tools = None
+extractor = None
 
-DB_PATH = "./resumes.db"
 
+def init_agent_clients():
+    global llm, engine, sql_tools, llm_with_tools, extractor
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=0.3,
-    google_api_key=GOOGLE_API_KEY
-)
+    if llm is not None:
+        return
+
+    if not GOOGLE_API_KEY:
+        raise ValueError("❌ GOOGLE_API_KEY missing in .env")
+
+    initialize_database()
+
+    llm = ChatGoogleGenerativeAI(
+        model=LLM_MODEL,
+        temperature=0.3,
+        google_api_key=GOOGLE_API_KEY
+    )
+
+    engine = create_engine(f"sqlite:///{DB_PATH}")
+    toolkit = SQLDatabaseToolkit(db=SQLDatabase(engine), llm=llm)
+    sql_tools = toolkit.get_tools()
 
+    llm_with_tools = llm.bind_tools(sql_tools)
 
-engine = create_engine(f"sqlite:///{DB_PATH}")
-db = SQLDatabase(engine)
+    extractor = LlamaExtract()
 
-toolkit = SQLDatabaseToolkit(db=db, llm=llm)
-sql_tools = toolkit.get_tools()
 
+def close_agent_clients():
+    global llm, engine, sql_tools, llm_with_tools, extractor
 
-llm_with_tools = llm.bind_tools(sql_tools)
+    if engine is not None:
+        engine.dispose()
+
+    llm = engine = sql_tools = llm_with_tools = extractor = None
+
+
+# ============================
+#   RESUME LOOKUP
+# ============================
+def load_resume_row(user_id: str) -> Dict[str, str]:
+    """Legacy resumes.db row, for callers with no stored resume."""
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT * FROM resumes WHERE user_id = :user_id"),
+            {"user_id": str(user_id)}
+        ).mappings().first()
+    return dict(row) if row else {}
+
+
+async def load_answer_resume(db: AsyncSession, user_id: int, resume_id: Optional[int] = None) -> Optional[Resume]:
+    """The stored resume to answer from: `resume_id` if given, else the newest one."""
+    query = select(Resume).where(Resume.user_id == user_id)
+    if resume_id is not None:
+        query = query.where(Resume.id == resume_id)
+    else:
+        query = query.order_by(Resume.id.desc()).limit(1)
+
+    resume = (await db.execute(query)).scalar_one_or_none()
+    if resume is None and resume_id is not None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
 
 
 # ============================
 #   MULTI-QUESTION RUNNER
 # ============================
-async def answer_sql_questions(user_id: str, questions: str) -> Dict[str, str]:
+async def answer_sql_questions(
+    user_id,
+    questions: str,
+    job_context: Optional[str] = None,
+    priority: str = INTERACTIVE,
+    resume: Optional[Resume] = None
+) -> Dict[str, str]:
+    """
+    Answer each question from `resume`, a stored resume of `users.id`
+    `user_id`, over its top-k indexed chunks. Without one, fall back to
+    the legacy resumes.db row keyed by `user_id`.
+    """
     question_list = [q.strip() for q in questions.split("\n") if q.strip()]
 
+    source = None
+    if resume is not None:
+        source = resume_source(resume.id)
+        fields = resume_fields(resume)
+        # No-op unless a write hook already indexed this exact content
+        with track_stage("agent.index_refresh"):
+            resume_indexes.upsert(user_id, source, fields)
+    else:
+        with track_stage("agent.resume_lookup"):
+            fields = load_resume_row(user_id)
+
     async def process(q):
-        prompt = f"""
-You are a resume analysis assistant with access to SQL tools.
-
-Below is the database schema you MUST use:
-
-TABLE resumes (
-    user_id TEXT PRIMARY KEY,
-    name TEXT,
-    skills TEXT,
-    experience TEXT,
-    knowledge TEXT,
-    education TEXT,
-    projects TEXT,
-    certifications TEXT
-);
-
-User ID: {user_id}
-Question: {q}
-
-You MUST:
-- Use SQL tools to answer the question.
-- Only use SQL queries based on the schema above.
-- Never guess column names or data.
-- Query only rows WHERE user_id = '{user_id}' unless asked otherwise.
-- If a question cannot be answered from the table, say so.
-"""
+        # Resume on hand: one LLM call over the relevant resume context
+        if fields:
+            chunks = None
+            if source:
+                with track_stage("agent.retrieve"):
+                    chunks = resume_indexes.search(user_id, source, q)
+
+            with track_stage("agent.prompt_build"):
+                messages = build_answer_messages(q, fields, chunks=chunks, job_context=job_context)
+
+            with track_stage("agent.llm_answer_pass"):
+                result = await llm.ainvoke(messages)
+            record_llm_usage(LLM_MODEL, result)
+            return q, result.content
 
+        with track_stage("agent.prompt_build"):
+            messages = build_sql_messages(user_id, q)
 
         # First pass: LLM decides tool usage
-        result = await llm_with_tools.ainvoke(prompt)
+        with track_stage("agent.llm_tool_pass"):
+            result = await llm_with_tools.ainvoke(messages)
+        record_llm_usage(LLM_MODEL, result)
 
         # If LLM used a tool
         if result.tool_calls:
@@ -98,18 +171,26 @@ You MUST:
             tool = next(t for t in sql_tools if t.name == tool_call["name"])
 
             # Run the SQL query
-            sql_output = tool.invoke(tool_call["args"])
+            with track_stage("agent.sql_tool"):
+                sql_output = tool.invoke(tool_call["args"])
 
             # Final LLM answer after tool result
-            final_response = llm.invoke(
-                f"SQL result: {sql_output}\n\nAnswer the question: {q}"
-            )
+            with track_stage("agent.llm_answer_pass"):
+                final_response = llm.invoke(
+                    f"SQL result: {truncate_to_tokens(str(sql_output), ANSWER_PROMPT_TOKEN_BUDGET)}"
+                    f"\n\nAnswer the question: {q}"
+                )
+            record_llm_usage(LLM_MODEL, final_response)
             return q, final_response.content
 
         # If no tool call
         return q, result.content
 
-    results = await asyncio.gather(*(process(q) for q in question_list))
+    # Each question waits for a fair-share slot instead of all firing at once
+    results = await asyncio.gather(*(
+        llm_scheduler.run(user_id, lambda q=q: process(q), priority)
+        for q in question_list
+    ))
     return dict(results)
 
 
@@ -126,6 +207,7 @@ def create_resume(db: Session, user: Users, data: ResumeCreate):
     db.add(resume)
     db.commit()
     db.refresh(resume)
+    resume_indexes.upsert(user.id, resume_source(resume.id), resume_fields(resume))
     return resume
 
 
@@ -140,14 +222,41 @@ def get_all_resumes(db: Session, user: Users):
     return db.query(Resume).filter(Resume.user_id == user.id).all()
 
 
+def get_resume_version(db: Session, resume_id: int, user: Users) -> int:
+    """Version-only probe on the primary key, for conditional GETs."""
+    version = db.query(Resume.version).filter(
+        Resume.id == resume_id, Resume.user_id == user.id
+    ).scalar()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return version
+
+
+def get_resume_list_version(db: Session, user: Users) -> tuple:
+    """
+    Aggregate fingerprint of the user's resumes: count and id sum change on
+    create/delete, version sum changes on every update.
+    """
+    return db.query(
+        func.count(Resume.id),
+        func.coalesce(func.sum(Resume.id), 0),
+        func.coalesce(func.sum(Resume.version), 0)
+    ).filter(Resume.user_id == user.id).one()
+
+
 def update_resume(db: Session, resume_id: int, user: Users, data: ResumeUpdate):
     resume = get_resume(db, resume_id, user)
 
     for field, value in data.dict(exclude_unset=True).items():
         setattr(resume, field, value)
 
+    # In-SQL increment: concurrent writers both land, last write wins
+    if db.is_modified(resume):
+        resume.version = Resume.version + 1
+
     db.commit()
     db.refresh(resume)
+    resume_indexes.upsert(user.id, resume_source(resume.id), resume_fields(resume))
     return resume
 
 
@@ -155,6 +264,7 @@ def delete_resume(db: Session, resume_id: int, user: Users):
     resume = get_resume(db, resume_id, user)
     db.delete(resume)
     db.commit()
+    resume_indexes.remove(user.id, resume_source(resume_id))
     return True
 
 
@@ -168,10 +278,6 @@ class ParsedResume(BaseModel):
     projects: str | None = Field(default=None)
     certifications: str | None = Field(default=None)
 
-
-extractor = LlamaExtract()
-
-
 def get_resume_agent():
     """Fetch persistent agent; create once if not exists."""
     
@@ -221,6 +327,7 @@ def parse_and_store_resume(file_path: str, db: Session, user: Users) -> Resume:
     db.add(resume)
     db.commit()
     db.refresh(resume)
+    resume_indexes.upsert(user.id, resume_source(resume.id), resume_fields(resume))
 
     return resume
 
@@ -234,5 +341,7 @@ if __name__ == "__main__":
 
     print("\n🚀 Running SQL-powered Gemini LLM Tool Calling...\n")
 
+    init_agent_clients()
+
     answers = asyncio.run(answer_sql_questions("user_12345", job_questions))
     print(json.dumps(answers, indent=4))
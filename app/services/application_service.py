@@ -1,26 +1,62 @@
 from langchain_groq import ChatGroq
 from langchain_classic.output_parsers import PydanticOutputParser
-from langchain_classic.prompts import PromptTemplate
 from schemas.applications import ApplicationExtract
 import os
 from dotenv import load_dotenv
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.applications import Application
+from db.models import Resume
 from schemas.applications import ApplicationExtract
-from uuid import UUID
+from services.metrics_service import track_stage, record_llm_usage
+from services.prompt_service import build_extraction_messages
+from services.digest_service import build_job_digest
+from services.scheduler_service import llm_scheduler, INTERACTIVE
+from services.response_service import STREAM_BATCH_ROWS
+from services.json_repair_service import parse_structured
+from services.posting_cleaner_service import clean_posting_async
+from services.job_description_service import store_job_description, decompress
+from models.job_descriptions import JobDescription
+from sqlalchemy import select, update, values, column, and_, or_, func, cast, Integer, String, Uuid
+from typing import AsyncIterator, List, Optional, Tuple
+from schemas.applications import StatusTransition, StatusTransitionResult
 
 load_dotenv()
 
-llm = ChatGroq(
-    model="llama-3.1-8b-instant",
-    temperature=0
-)
+LLM_MODEL = "llama-3.1-8b-instant"
 
+# Per-process client, created by init_extraction_clients() in each
+# worker's lifespan rather than at import.
+llm = None
+json_llm = None
+
+
+def init_extraction_clients():
+    global llm, json_llm
+
+    if llm is not None:
+        return
+
+    llm = ChatGroq(
+        model=LLM_MODEL,
+        temperature=0
+    )
+
+    # Provider-native JSON mode: Groq constrains decoding to a JSON object.
+    # Bound once per process instead of rebuilding a chain per call.
+    json_llm = llm.bind(response_format={"type": "json_object"})
+
+
+def close_extraction_clients():
+    global llm, json_llm
+    llm = json_llm = None
+
+# Only used for its format instructions; parsing goes through parse_structured
 parser = PydanticOutputParser(pydantic_object=ApplicationExtract)
 
-prompt = PromptTemplate(
-    template="""
-You are an information extraction system.
+# Static extraction instructions, identical on every call so the
+# provider can cache the prefix; only INPUT TEXT varies.
+EXTRACTION_PROMPT = f"""You are an information extraction system.
 
 Extract the following fields from the input text:
 
@@ -37,45 +73,246 @@ Rules:
 - job_description should contain the full JD text
 - final_date must be in ISO format (YYYY-MM-DD)
 
-{format_instructions}
+{parser.get_format_instructions()}"""
 
-INPUT TEXT:
-{input_text}
-""",
-    input_variables=["input_text"],
-    partial_variables={
-        "format_instructions": parser.get_format_instructions()
-    }
-)
 
-
-async def extract_application_fields(input_text: str) -> ApplicationExtract:
+async def extract_application_fields(
+    input_text: str,
+    user_id: str = "anonymous",
+    priority: str = INTERACTIVE,
+    clean: bool = True
+) -> ApplicationExtract:
     """
-    Takes raw job text and returns structured application fields
+    Takes raw job text and returns structured application fields.
+    Page chrome (nav, cookie banners, similar jobs, legal footers) is
+    stripped locally first unless clean=False.
     """
-    chain = prompt | llm | parser
-    return await chain.ainvoke({"input_text": input_text})
+    if clean:
+        with track_stage("application.clean"):
+            input_text = (await clean_posting_async(input_text)).text
+
+    with track_stage("application.prompt_build"):
+        messages = build_extraction_messages(EXTRACTION_PROMPT, input_text)
+
+    with track_stage("application.llm_extract"):
+        message = await llm_scheduler.run(user_id, lambda: json_llm.ainvoke(messages), priority)
+    record_llm_usage(LLM_MODEL, message)
+
+    # Strict parse, then local repair (fences, trailing text, dates, nulls)
+    with track_stage("application.parse"):
+        return parse_structured(message.content, ApplicationExtract)
 
 
 async def create_application(
     db: AsyncSession,
-    user_id: UUID,
+    user_id: int,
     extracted: ApplicationExtract
 ) -> Application:
+    with track_stage("application.store_description"):
+        description_hash = await store_job_description(db, extracted.job_description)
+
     application = Application(
         user_id=user_id,
         resume_id=None,
         job_role=extracted.job_role,
-        job_description=extracted.job_description,
+        job_description_hash=description_hash,
         company_name=extracted.company_name,
         company_description=extracted.company_description,
+        job_digest=build_job_digest(
+            extracted.job_role,
+            extracted.company_name,
+            extracted.job_description,
+            extracted.company_description
+        ),
         final_date=extracted.final_date,
         status="draft",
         response=None
     )
 
     db.add(application)
-    await db.commit()
-    await db.refresh(application)
+    with track_stage("application.db_commit"):
+        await db.commit()
+        await db.refresh(application)
 
     return application
+
+
+async def stream_applications(
+    db: AsyncSession,
+    user_id: int,
+    include_description: bool = False
+) -> AsyncIterator[Tuple[Application, Optional[str]]]:
+    """
+    Server-side cursor over the user's applications, newest first, one
+    (application, description) pair at a time. Description bodies live in
+    job_descriptions and are only joined in when include_description is set.
+    """
+    query = (
+        select(Application)
+        .where(Application.user_id == user_id)
+        .order_by(Application.applied_at.desc())
+        .execution_options(yield_per=STREAM_BATCH_ROWS)
+    )
+    if include_description:
+        query = query.add_columns(JobDescription.body).join(
+            JobDescription,
+            JobDescription.content_hash == Application.job_description_hash
+        )
+
+    result = await db.stream(query)
+    async for row in result:
+        yield row[0], decompress(row[1]) if include_description else None
+
+
+async def get_job_digest(db: AsyncSession, user_id: int, application_id) -> Optional[str]:
+    """Digest column only, scoped to the owner; another user's id is a 404."""
+    result = await db.execute(
+        select(Application.id, Application.job_digest).where(
+            Application.id == application_id,
+            Application.user_id == user_id
+        )
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return row.job_digest
+
+
+# ============================
+#   STATUS LIFECYCLE
+# ============================
+# Statuses that the resume_required_for_applied CheckConstraint guards
+RESUME_REQUIRED_STATUSES = ("applied", "screened", "interviewed", "selected", "rejected")
+
+ALLOWED_TRANSITIONS = {
+    "draft": {"applied"},
+    "applied": {"screened", "interviewed", "rejected"},
+    "screened": {"interviewed", "rejected"},
+    "interviewed": {"selected", "rejected"},
+    "selected": set(),
+    "rejected": set(),
+}
+
+
+def _transition_error(current: Application, target: str, expected_version: int, resume_id: Optional[int]) -> str:
+    if current.version != expected_version:
+        return "version_conflict"
+    if target not in ALLOWED_TRANSITIONS.get(current.status, set()):
+        return f"invalid_transition:{current.status}->{target}"
+    if target in RESUME_REQUIRED_STATUSES and current.resume_id is None and resume_id is None:
+        return "resume_required"
+    return "conflict"
+
+
+async def bulk_transition_status(
+    db: AsyncSession,
+    user_id: int,
+    transitions: List[StatusTransition]
+) -> List[StatusTransitionResult]:
+    """
+    Apply many status changes in one set-based UPDATE.
+
+    Each row only moves if it belongs to the user, is still at the version
+    the client saw, the lifecycle allows current -> target, and the
+    resume constraint holds. A transition may attach one of the user's
+    resumes in the same UPDATE (needed to leave draft). Rows that did not
+    move are re-read in one query to explain why.
+    """
+    # Last write wins for duplicate ids within the batch
+    requested = {t.id: t for t in transitions}
+
+    # Attached resumes must be the caller's own; one probe for the batch
+    resume_ids = {t.resume_id for t in requested.values() if t.resume_id is not None}
+    owned = set()
+    if resume_ids:
+        owned = set((await db.scalars(
+            select(Resume.id).where(Resume.id.in_(resume_ids), Resume.user_id == user_id)
+        )).all())
+
+    rejected = {}
+    for i, t in requested.items():
+        if t.status not in ALLOWED_TRANSITIONS:
+            rejected[i] = f"unknown_status:{t.status}"
+        elif t.resume_id is not None and t.resume_id not in owned:
+            rejected[i] = "resume_not_found"
+    candidates = [t for i, t in requested.items() if i not in rejected]
+
+    updated = {}
+    if candidates:
+        incoming = values(
+            column("id", Uuid(as_uuid=True)),
+            column("status", String),
+            column("expected_version", Integer),
+            column("resume_id", Integer),
+            name="incoming"
+        ).data([(t.id, t.status, t.version, t.resume_id) for t in candidates])
+        # All-NULL VALUES columns are untyped in Postgres
+        incoming_resume_id = cast(incoming.c.resume_id, Integer)
+
+        lifecycle = values(
+            column("from_status", String),
+            column("to_status", String),
+            name="lifecycle"
+        ).data([(a, b) for a, targets in ALLOWED_TRANSITIONS.items() for b in targets])
+
+        stmt = (
+            update(Application)
+            .where(
+                Application.id == incoming.c.id,
+                Application.user_id == user_id,
+                Application.version == incoming.c.expected_version,
+                lifecycle.c.from_status == Application.status,
+                lifecycle.c.to_status == incoming.c.status,
+                or_(
+                    incoming.c.status.not_in(RESUME_REQUIRED_STATUSES),
+                    Application.resume_id.is_not(None),
+                    incoming_resume_id.is_not(None)
+                )
+            )
+            .values(
+                status=incoming.c.status,
+                resume_id=func.coalesce(incoming_resume_id, Application.resume_id),
+                version=Application.version + 1,
+                updated_at=func.now()
+            )
+            .returning(Application.id, Application.status, Application.version, Application.resume_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        with track_stage("application.bulk_status_update"):
+            result = await db.execute(stmt)
+            updated = {row.id: row for row in result}
+            await db.commit()
+
+    failed = [i for i in requested if i not in updated and i not in rejected]
+    current = {}
+    if failed:
+        result = await db.execute(
+            select(Application).where(
+                and_(Application.id.in_(failed), Application.user_id == user_id)
+            )
+        )
+        current = {a.id: a for a in result.scalars()}
+
+    outcomes = []
+    for app_id, t in requested.items():
+        if app_id in updated:
+            row = updated[app_id]
+            outcomes.append(StatusTransitionResult(
+                id=app_id, ok=True, status=row.status, version=row.version, resume_id=row.resume_id
+            ))
+        elif app_id in rejected:
+            outcomes.append(StatusTransitionResult(id=app_id, ok=False, error=rejected[app_id]))
+        elif app_id not in current:
+            outcomes.append(StatusTransitionResult(id=app_id, ok=False, error="not_found"))
+        else:
+            row = current[app_id]
+            outcomes.append(StatusTransitionResult(
+                id=app_id,
+                ok=False,
+                status=row.status,
+                version=row.version,
+                resume_id=row.resume_id,
+                error=_transition_error(row, t.status, t.version, t.resume_id)
+            ))
+    return outcomes
@@ -46,9 +46,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 # JWT Decode
 # -----------------------
 def decode_access_token(token: str) -> dict:
-    print("DECODE START")
-    print("TOKEN:", token)
-
     try:
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
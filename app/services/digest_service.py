@@ -0,0 +1,63 @@
+# services/digest_service.py
+
+import os
+import re
+from typing import List, Optional
+
+from services.prompt_service import count_tokens, truncate_to_tokens
+
+JOB_DIGEST_TOKEN_BUDGET = int(os.getenv("JOB_DIGEST_TOKEN_BUDGET", "200"))
+JOB_DIGEST_MAX_REQUIREMENTS = 8
+
+_BULLET = re.compile(r"^\s*(?:[-*•·▪◦]|\d+[.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_REQUIREMENT_HINTS = re.compile(
+    r"\b(require[sd]?|requirements?|must|experience|years?|proficien\w*|knowledge of|"
+    r"familiar\w*|degree|skills?|qualifications?|strong|ability to|expertise)\b",
+    re.IGNORECASE,
+)
+
+
+def _requirement_lines(job_description: str) -> List[str]:
+    """Bullets and sentences that read like requirements, in posting order."""
+    lines = [line.strip() for line in job_description.splitlines() if line.strip()]
+    bullets = [_BULLET.sub("", line) for line in lines if _BULLET.match(line)]
+    candidates = bullets or [s.strip() for line in lines for s in _SENTENCE.split(line)]
+
+    seen, picked = set(), []
+    for line in candidates:
+        key = line.lower()
+        if key in seen or not _REQUIREMENT_HINTS.search(line):
+            continue
+        seen.add(key)
+        picked.append(" ".join(line.split()[:25]))
+        if len(picked) == JOB_DIGEST_MAX_REQUIREMENTS:
+            break
+    return picked
+
+
+def build_job_digest(
+    job_role: str,
+    company_name: str,
+    job_description: str,
+    company_description: Optional[str] = None,
+    budget: int = JOB_DIGEST_TOKEN_BUDGET
+) -> str:
+    """
+    Compact, extractive summary of a posting for answer prompts:
+    role, key requirements and a one-to-two sentence company summary.
+    """
+    parts = [f"Role: {job_role} at {company_name}"]
+
+    requirements = _requirement_lines(job_description or "")
+    if requirements:
+        parts.append("Key requirements:\n" + "\n".join(f"- {r}" for r in requirements))
+
+    if company_description:
+        summary = " ".join(_SENTENCE.split(company_description.strip())[:2])
+        parts.append(f"Company: {summary}")
+
+    digest = "\n".join(parts)
+    if count_tokens(digest) > budget:
+        digest = truncate_to_tokens(digest, budget)
+    return digest
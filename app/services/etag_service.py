@@ -0,0 +1,34 @@
+# services/etag_service.py
+
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+# Bump when a response shape changes so cached bodies are invalidated
+ETAG_SCHEMA_VERSION = "1"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the version parts of a resource."""
+    raw = ":".join(str(p) for p in (ETAG_SCHEMA_VERSION, *parts))
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
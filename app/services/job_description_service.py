@@ -0,0 +1,56 @@
+# services/job_description_service.py
+
+import hashlib
+import re
+import unicodedata
+import zlib
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.job_descriptions import JobDescription
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + collapsed whitespace, so trivially different copies share a hash."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def content_hash(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def compress(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress(body: bytes) -> str:
+    return zlib.decompress(body).decode("utf-8")
+
+
+async def store_job_description(db: AsyncSession, text: str) -> str:
+    """
+    Insert the description once and return its hash. The hash is over the
+    normalized text; the body keeps the first copy's original formatting
+    (paragraphs, bullets). Concurrent inserts of the same posting collapse
+    on the primary key. Joins the caller's transaction; the caller commits.
+    """
+    digest = content_hash(normalize_text(text))
+
+    await db.execute(
+        insert(JobDescription)
+        .values(content_hash=digest, body=compress(text), size=len(text))
+        .on_conflict_do_nothing(index_elements=[JobDescription.content_hash])
+    )
+    return digest
+
+
+async def load_job_description(db: AsyncSession, digest: str) -> Optional[str]:
+    body = await db.scalar(
+        select(JobDescription.body).where(JobDescription.content_hash == digest)
+    )
+    return decompress(body) if body is not None else None
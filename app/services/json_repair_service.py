@@ -0,0 +1,178 @@
+# services/json_repair_service.py
+
+import json
+import re
+from datetime import date, datetime
+from typing import Callable, Iterator, Optional, Tuple, Type, get_args
+
+from prometheus_client import Counter
+from pydantic import BaseModel, ValidationError
+
+PARSE_OUTCOMES = Counter(
+    "applyr_structured_parse_total",
+    "Structured LLM output parses by outcome (clean, repaired, failed)",
+    ["schema", "outcome"],
+)
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"None": "null", "True": "true", "False": "false"}
+_PY_LITERAL = re.compile(r"\b(None|True|False)\b")
+_ORDINAL = re.compile(r"(\d+)(st|nd|rd|th)\b", re.IGNORECASE)
+
+# Values models use to mean "not present"
+NULL_LIKE = {"", "null", "none", "n/a", "na", "not mentioned", "not specified", "unknown", "-"}
+
+# Tried in order; day-first before month-first (postings are mostly Indian)
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y/%m/%d", "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
+    "%m/%d/%Y", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y",
+    "%B %Y", "%b %Y",
+]
+
+
+class RepairError(ValueError):
+    pass
+
+
+# -----------------------
+# Text-level repair
+# -----------------------
+def _segments(text: str) -> Iterator[Tuple[bool, str]]:
+    """Split JSON text into (is_string, chunk) runs; string chunks keep their quotes."""
+    start, in_string, escaped = 0, False, False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                yield True, text[start:i + 1]
+                start, in_string = i + 1, False
+        elif ch == '"':
+            if i > start:
+                yield False, text[start:i]
+            start, in_string = i, True
+    if start < len(text):
+        yield in_string, text[start:]
+
+
+def _outside_strings(text: str, fix: Callable[[str], str]) -> str:
+    """Apply `fix` to the structural text only, never to string values."""
+    return "".join(chunk if is_string else fix(chunk) for is_string, chunk in _segments(text))
+
+
+def _fix_structure(chunk: str) -> str:
+    chunk = _TRAILING_COMMA.sub(r"\1", chunk)
+    return _PY_LITERAL.sub(lambda m: _PY_LITERALS[m.group(1)], chunk)
+
+
+def extract_json_object(text: str) -> str:
+    """
+    Strip code fences and any prose around the first balanced {...} object,
+    tracking strings so braces inside values do not confuse the scan.
+    """
+    text = _FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start == -1:
+        raise RepairError("No JSON object in model output")
+
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    # Truncated output: close what is open and let json decide
+    return text[start:] + ("\"" if in_string else "") + "}" * depth
+
+
+def repair_json_text(text: str) -> dict:
+    candidate = _outside_strings(extract_json_object(text), _fix_structure)
+    try:
+        data = json.loads(candidate, strict=False)
+    except json.JSONDecodeError as e:
+        raise RepairError(f"Unrepairable JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise RepairError("Model output is not a JSON object")
+    return data
+
+
+# -----------------------
+# Field-level repair
+# -----------------------
+def parse_date(value) -> Optional[date]:
+    """Best-effort date parsing; unknown formats become None rather than a guess."""
+    if value is None or isinstance(value, date):
+        return value
+    raw = _ORDINAL.sub(r"\1", str(value).strip()).replace(",", " ")
+    raw = " ".join(raw.split())
+    if raw.lower() in NULL_LIKE:
+        return None
+    try:
+        return datetime.fromisoformat(raw).date()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _accepts_date(annotation) -> bool:
+    """`date` or Optional[date]/Union[..., date]; datetime fields are left alone."""
+    return annotation is date or date in get_args(annotation)
+
+
+def normalize_fields(data: dict, schema: Type[BaseModel]) -> dict:
+    """Null-vs-missing, null-like strings and date coercion against `schema`."""
+    fields = schema.model_fields
+    cleaned = {}
+    for name, field in fields.items():
+        value = data.get(name)
+        if isinstance(value, str) and value.strip().lower() in NULL_LIKE:
+            value = None
+        if _accepts_date(field.annotation) and value is not None:
+            value = parse_date(value)
+        if value is None and not field.is_required():
+            value = field.default
+        cleaned[name] = value
+    return cleaned
+
+
+def parse_structured(text: str, schema: Type[BaseModel]):
+    """
+    Validate model output against `schema`: strict parse first, then local
+    repair, so malformed output costs microseconds instead of another LLM call.
+    """
+    label = schema.__name__
+    try:
+        result = schema.model_validate_json(text)
+        PARSE_OUTCOMES.labels(schema=label, outcome="clean").inc()
+        return result
+    except ValidationError:
+        pass
+
+    try:
+        result = schema.model_validate(normalize_fields(repair_json_text(text), schema))
+    except (RepairError, ValidationError):
+        PARSE_OUTCOMES.labels(schema=label, outcome="failed").inc()
+        raise
+    PARSE_OUTCOMES.labels(schema=label, outcome="repaired").inc()
+    return result
@@ -0,0 +1,132 @@
+# services/metrics_service.py
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Set (before prometheus_client is imported) when running several workers;
+# each worker then writes its samples to files in this directory
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# -----------------------
+# Prometheus collectors
+# -----------------------
+STAGE_LATENCY = Histogram(
+    "applyr_stage_duration_seconds",
+    "Latency of individual hot-path stages",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+REQUEST_LATENCY = Histogram(
+    "applyr_request_duration_seconds",
+    "End-to-end HTTP request latency",
+    ["method", "route", "status"],
+)
+
+LLM_TOKENS = Counter(
+    "applyr_llm_tokens_total",
+    "Tokens consumed by LLM calls",
+    ["model", "kind"],
+)
+
+RETRIES = Counter(
+    "applyr_retries_total",
+    "Retried attempts of wrapped operations",
+    ["operation"],
+)
+
+
+# Per-request list of (stage, seconds), shared with threadpool workers
+# because they run in a copy of the request context.
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "applyr_request_timings", default=None
+)
+
+
+def start_request_timings() -> List[Tuple[str, float]]:
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+@contextmanager
+def track_stage(stage: str):
+    """Time a block, export it to Prometheus and to the Server-Timing header."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage=stage).observe(elapsed)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def record_llm_usage(model: str, message) -> None:
+    """Count input/output tokens reported on a LangChain AIMessage."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens")
+    output_tokens = usage.get("output_tokens")
+    if input_tokens:
+        LLM_TOKENS.labels(model=model, kind="input").inc(input_tokens)
+    if output_tokens:
+        LLM_TOKENS.labels(model=model, kind="output").inc(output_tokens)
+
+
+def record_retry(operation: str) -> None:
+    RETRIES.labels(operation=operation).inc()
+
+
+def format_server_timing(timings: List[Tuple[str, float]], total: float) -> str:
+    """
+    Build a Server-Timing header value. Stages that ran several times
+    (e.g. one LLM pass per question) are summed and annotated with a count.
+    """
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for stage, elapsed in timings:
+        totals[stage] = totals.get(stage, 0.0) + elapsed
+        counts[stage] = counts.get(stage, 0) + 1
+
+    parts = []
+    for stage, elapsed in totals.items():
+        entry = f"{stage};dur={elapsed * 1000:.1f}"
+        if counts[stage] > 1:
+            entry += f';desc="x{counts[stage]}"'
+        parts.append(entry)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# -----------------------
+# Exposition
+# -----------------------
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Prometheus exposition for /metrics. With several workers a scrape hits
+    one of them at random, so aggregate every worker's files instead.
+    """
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the aggregate on shutdown."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
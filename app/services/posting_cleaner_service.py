@@ -0,0 +1,262 @@
+# services/posting_cleaner_service.py
+
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from prometheus_client import Histogram
+from pydantic import BaseModel
+
+# Inputs above this size are cleaned in a worker process
+CLEAN_POOL_THRESHOLD = int(os.getenv("CLEAN_POOL_THRESHOLD", "100000"))
+CLEAN_POOL_WORKERS = int(os.getenv("CLEAN_POOL_WORKERS", "2"))
+
+# Less cleaned text than this from a full page means the cleaner ate the posting
+CLEAN_MIN_CHARS = int(os.getenv("CLEAN_MIN_CHARS", "200"))
+
+# Lines kept above the detected block (title, company, location)
+LEAD_IN_LINES = 3
+
+CLEAN_REDUCTION = Histogram(
+    "applyr_posting_clean_reduction_ratio",
+    "Fraction of posting characters removed before extraction",
+    buckets=(0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1),
+)
+
+# Elements that never hold the job description
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe", "canvas",
+    "nav", "header", "footer", "aside", "form", "button", "select", "dialog",
+}
+# A <header> inside these is the posting's own title block, not site chrome
+CONTENT_TAGS = {"article", "main"}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "header", "li", "ul", "ol", "br", "tr",
+    "table", "h1", "h2", "h3", "h4", "h5", "h6", "dd", "dt", "blockquote", "pre",
+}
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "area", "base", "col", "embed", "source", "track", "wbr"}
+
+# class/id/role values that mark chrome around the posting. Matched as
+# whole words of a class name ("share-bar", not "shared-content").
+BOILERPLATE_ATTR = re.compile(
+    r"(?<![a-z0-9])(?:cookies?|consent|gdpr|banner|navbar|nav|menu|breadcrumbs?|footer|sidebar|"
+    r"similar|related|recommended|recommendations?|more-jobs|share|social|newsletter|signup|"
+    r"sign-in|login|modal|popup|advert|ads?|promo|legal)(?![a-z0-9])",
+    re.IGNORECASE,
+)
+
+# Lines that are nothing but a UI control label ("Sign in", "Apply now | Save job")
+CHROME_LINE = re.compile(
+    r"^(?:[\W_]*(?:sign in|log in|sign up|create (?:an )?account|apply now|save job|"
+    r"share this job|report (?:this )?job|back to (?:search|jobs)|skip to (?:main )?content|"
+    r"accept(?: all)?(?: cookies)?|reject all|cookie settings|manage preferences))+[\W_]*$",
+    re.IGNORECASE,
+)
+
+# Legal/consent boilerplate, matched on whole words anywhere in a short line
+LEGAL_LINE = re.compile(
+    r"\b(?:we use cookies|cookie (?:policy|settings|preferences)|privacy policy|"
+    r"terms of (?:use|service)|all rights reserved|equal opportunity employer|"
+    r"reasonable accommodation)\b|©",
+    re.IGNORECASE,
+)
+
+# Headings after which everything is other listings
+TAIL_SECTION = re.compile(
+    r"^(similar|related|recommended|more) (jobs|roles|positions|openings)|^people also (viewed|applied)|"
+    r"^jobs you may like|^other jobs",
+    re.IGNORECASE,
+)
+
+JD_HINT = re.compile(
+    r"responsibilit|requirement|qualification|experience|skills?\b|about (the|this) (role|job|position)|"
+    r"what you('ll| will)|we are looking|you will|must have|nice to have|benefits|"
+    r"salary|location|apply by|deadline|job description|role overview|about us|about the company",
+    re.IGNORECASE,
+)
+
+_TAG = re.compile(r"<[a-zA-Z!/][^>]*>")
+
+
+class CleanedPosting(BaseModel):
+    text: str
+    original_chars: int
+    cleaned_chars: int
+
+    @property
+    def reduction(self) -> float:
+        if not self.original_chars:
+            return 0.0
+        return 1 - self.cleaned_chars / self.original_chars
+
+
+# -----------------------
+# HTML -> text lines
+# -----------------------
+class _TextExtractor(HTMLParser):
+    """Collect text from HTML, dropping boilerplate subtrees entirely."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._current: List[str] = []
+        self._stack: List[str] = []
+        self._skip_depth: Optional[int] = None
+
+    def _flush(self):
+        line = " ".join("".join(self._current).split())
+        if line:
+            self.lines.append(line)
+        self._current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br" and self._skip_depth is None:
+                self._flush()
+            return
+
+        self._stack.append(tag)
+        if self._skip_depth is not None:
+            return
+
+        marker = " ".join(v for k, v in attrs if k in ("class", "id", "role", "aria-label") and v)
+        in_content = tag == "header" and any(t in CONTENT_TAGS for t in self._stack)
+        if (tag in SKIP_TAGS and not in_content) or (marker and BOILERPLATE_ATTR.search(marker)):
+            self._skip_depth = len(self._stack)
+            return
+
+        if tag in BLOCK_TAGS:
+            self._flush()
+            if tag == "li":
+                self._current.append("- ")
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or tag not in self._stack:
+            return
+        # Pop to the matching open tag, tolerating unclosed children
+        while self._stack:
+            depth = len(self._stack)
+            open_tag = self._stack.pop()
+            if self._skip_depth is not None and depth <= self._skip_depth:
+                self._skip_depth = None
+            if open_tag == tag:
+                break
+        if self._skip_depth is None and tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth is None:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def html_to_lines(raw: str) -> List[str]:
+    if not _TAG.search(raw):
+        return [" ".join(unescape(line).split()) for line in raw.splitlines()]
+    extractor = _TextExtractor()
+    extractor.feed(raw)
+    extractor.close()
+    return extractor.lines
+
+
+# -----------------------
+# Boilerplate + main block
+# -----------------------
+def _line_score(line: str) -> int:
+    words = len(line.split())
+    if JD_HINT.search(line):
+        return 3
+    if words >= 8 or line.startswith("- "):
+        return 1
+    # Short, unpunctuated fragments are usually menu items or tags
+    return -2 if words <= 3 and not line.rstrip().endswith((":", ".")) else 0
+
+
+def main_block(lines: List[str]) -> List[str]:
+    """
+    Maximum-sum contiguous run of lines by job-description score (Kadane),
+    plus a short lead-in: the title and company usually sit just above it.
+    """
+    best, best_range = float("-inf"), (0, len(lines))
+    running, start = 0, 0
+    for i, line in enumerate(lines):
+        if running <= 0:
+            running, start = 0, i
+        running += _line_score(line)
+        if running > best:
+            best, best_range = running, (start, i + 1)
+    return lines[max(0, best_range[0] - LEAD_IN_LINES):best_range[1]]
+
+
+def clean_posting(raw: str) -> CleanedPosting:
+    """Strip page chrome from a captured posting and keep the job-description block."""
+    lines, seen = [], set()
+    for line in html_to_lines(raw or ""):
+        if not line:
+            continue
+        if TAIL_SECTION.search(line):
+            break
+        if CHROME_LINE.match(line) or (len(line) < 200 and LEGAL_LINE.search(line)):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+
+    block = main_block(lines) if lines else []
+    # Too little survived: the detector misfired, keep all cleaned lines
+    if sum(map(len, block)) < 0.3 * sum(map(len, lines)):
+        block = lines
+
+    text = "\n".join(block)
+    # Misfire (nothing, or a sliver of a full page, survived): extraction on
+    # the raw input beats an empty prompt
+    if not text or (len(text) < CLEAN_MIN_CHARS and len(raw or "") >= 10 * CLEAN_MIN_CHARS):
+        text = (raw or "").strip()
+    return CleanedPosting(text=text, original_chars=len(raw or ""), cleaned_chars=len(text))
+
+
+# -----------------------
+# Worker pool for large inputs
+# -----------------------
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, never fork: this runs inside a live, multi-threaded worker
+        # (threadpool, profiler, locks) whose state must not be copied
+        _pool = ProcessPoolExecutor(
+            max_workers=CLEAN_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def clean_posting_async(raw: str) -> CleanedPosting:
+    """Small inputs inline; large ones in a worker process so the loop stays free."""
+    if len(raw) < CLEAN_POOL_THRESHOLD:
+        result = clean_posting(raw)
+    else:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_pool(), clean_posting, raw)
+
+    CLEAN_REDUCTION.observe(result.reduction)
+    return result
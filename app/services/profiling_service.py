@@ -0,0 +1,169 @@
+# services/profiling_service.py
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Opt-in request profiling. A request is profiled when it carries the
+# admin header with the right token, or when it is picked by sampling.
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL_MS", "5")) / 1000
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+PROFILE_MAX_AGE_HOURS = float(os.getenv("PROFILE_MAX_AGE_HOURS", "72"))
+
+PROFILE_HEADER = "X-Applyr-Profile"
+
+# Profiles sample every thread, so concurrent requests show up in them too
+PROFILE_SCOPE = "process"
+
+# Leaf frames that mean "this thread is parked", not doing work
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("base_events.py", "_run_once"),
+    # uvloop runs its loop in C; the deepest Python frame is the runner
+    ("runners.py", "run"),
+}
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    if not PROFILING_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), PROFILING_ADMIN_TOKEN.encode())
+
+
+def should_profile(header_value: Optional[str]) -> bool:
+    if is_admin_token(header_value):
+        return True
+    return PROFILING_SAMPLE_RATE > 0 and random.random() < PROFILING_SAMPLE_RATE
+
+
+# -----------------------
+# Sampling profiler
+# -----------------------
+class SamplingProfiler:
+    """
+    Samples the stacks of every busy thread on a fixed interval and
+    aggregates them as collapsed ("folded") stacks, the input format of
+    flamegraph.pl and speedscope. All threads are sampled because sync
+    endpoints run in the threadpool, not on the event loop thread.
+
+    Python cannot attribute a threadpool thread to the request that
+    scheduled it, so a profile is process-wide: it also contains whatever
+    other requests were running during the window, under their own thread
+    names. Profile on a quiet worker when a clean per-request view matters.
+    """
+
+    def __init__(self, interval: float = PROFILING_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="applyr-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if leaf in _IDLE_LEAVES:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                self.samples[self._fold(names.get(ident, str(ident)), frame)] += 1
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ";".join(reversed(stack))
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+# -----------------------
+# Storage with bounded retention
+# -----------------------
+def save_profile(profiler: SamplingProfiler, method: str, path: str, duration: float) -> Optional[str]:
+    if not profiler.samples:
+        return None
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    route = _SAFE_NAME.sub("_", path.strip("/")) or "root"
+    name = f"{stamp}_{method}_{route}_{int(duration * 1000)}ms.folded"
+
+    with open(os.path.join(PROFILE_DIR, name), "w") as f:
+        f.write(profiler.folded())
+
+    enforce_retention()
+    return name
+
+
+def enforce_retention():
+    """Drop profiles older than the max age, then the oldest beyond the max count."""
+    entries = list_profiles()
+    cutoff = time.time() - PROFILE_MAX_AGE_HOURS * 3600
+
+    for i, entry in enumerate(entries):
+        if i >= PROFILE_MAX_FILES or entry["created_at"] < cutoff:
+            try:
+                os.remove(os.path.join(PROFILE_DIR, entry["name"]))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict]:
+    """Stored profiles, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+
+    entries = []
+    for name in os.listdir(PROFILE_DIR):
+        if not name.endswith(".folded"):
+            continue
+        stat = os.stat(os.path.join(PROFILE_DIR, name))
+        entries.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": stat.st_mtime,
+            "scope": PROFILE_SCOPE
+        })
+
+    entries.sort(key=lambda e: e["created_at"], reverse=True)
+    return entries
+
+
+def profile_path(name: str) -> Optional[str]:
+    if os.path.basename(name) != name or not name.endswith(".folded"):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
@@ -0,0 +1,204 @@
+# services/prompt_service.py
+
+import math
+import os
+import re
+from typing import Dict, List, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+# Per-request input token budgets
+ANSWER_PROMPT_TOKEN_BUDGET = int(os.getenv("ANSWER_PROMPT_TOKEN_BUDGET", "1500"))
+EXTRACTION_PROMPT_TOKEN_BUDGET = int(os.getenv("EXTRACTION_PROMPT_TOKEN_BUDGET", "6000"))
+
+RESUME_SECTIONS = [
+    "skills",
+    "experience",
+    "knowledge",
+    "education",
+    "projects",
+    "certifications",
+]
+
+# Words that point a question at a resume section
+SECTION_KEYWORDS = {
+    "skills": {"skill", "skills", "language", "languages", "framework", "frameworks", "tool", "tools", "stack", "technology", "technologies", "proficient"},
+    "experience": {"experience", "work", "worked", "job", "role", "roles", "company", "employer", "years", "responsibilities", "internship", "career"},
+    "knowledge": {"knowledge", "familiar", "understand", "concept", "concepts", "domain", "expertise"},
+    "education": {"education", "degree", "university", "college", "school", "gpa", "graduate", "graduated", "study", "studied", "major"},
+    "projects": {"project", "projects", "built", "build", "developed", "portfolio", "github"},
+    "certifications": {"certification", "certifications", "certificate", "certified", "course", "courses", "license"},
+}
+
+# Filler that says nothing about which section a question targets
+STOPWORDS = {
+    "the", "and", "you", "your", "yours", "are", "was", "were", "what", "which", "who", "whom",
+    "how", "why", "when", "where", "did", "does", "have", "has", "had", "for", "with", "from",
+    "this", "that", "these", "those", "any", "all", "can", "could", "would", "should", "will",
+    "about", "into", "our", "their", "them", "they", "there", "here", "please", "describe",
+    "tell", "give", "list", "share", "explain", "some", "more", "most", "other", "than", "then",
+    "also", "just", "been", "being", "not", "but", "out", "its", "his", "her", "may",
+}
+
+# Content-word overlap needed to pick a section no keyword pointed at
+SECTION_MIN_OVERLAP = 2
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+
+
+# -----------------------
+# Local token counting
+# -----------------------
+def count_tokens(text: str) -> int:
+    """
+    Approximate BPE token count without a network round trip.
+    Words are split into ~4-character pieces, punctuation counts as one.
+    """
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _WORD.findall(text))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Keep the head of `text` that fits in `budget` tokens."""
+    if budget <= 0 or not text:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+
+    used = 0
+    for match in _WORD.finditer(text):
+        used += max(1, math.ceil(len(match.group()) / 4))
+        if used > budget:
+            return text[:match.start()].rstrip() + " …[truncated]"
+    return text
+
+
+def _words(text: str) -> set:
+    words = {w.lower() for w in re.findall(r"\w+", text or "") if len(w) > 2}
+    return words - STOPWORDS
+
+
+# -----------------------
+# Resume section selection
+# -----------------------
+def select_resume_sections(question: str, resume: Dict[str, Optional[str]]) -> List[str]:
+    """
+    Rank the non-empty resume sections by relevance to the question.
+    A section is relevant when a section keyword hits, or when it shares
+    at least SECTION_MIN_OVERLAP content words with the question.
+    Falls back to every non-empty section when nothing matches.
+    """
+    q_words = _words(question)
+    scored, available = [], []
+    for section in RESUME_SECTIONS:
+        content = resume.get(section)
+        if not content:
+            continue
+        available.append(section)
+        keyword_hits = len(q_words & SECTION_KEYWORDS[section])
+        overlap = len(q_words & _words(content))
+        if keyword_hits or overlap >= SECTION_MIN_OVERLAP:
+            scored.append((2 * keyword_hits + overlap, section))
+
+    relevant = [section for _, section in sorted(scored, key=lambda s: -s[0])]
+    return relevant or available
+
+
+def build_context(sections: List[tuple], budget: int) -> str:
+    """Fill `budget` with (label, text) pairs in order, truncating the last one that fits."""
+    parts = []
+    remaining = budget
+    for label, text in sections:
+        header = f"[{label}]\n"
+        remaining -= count_tokens(header)
+        if remaining <= 0:
+            break
+        body = truncate_to_tokens(text, remaining)
+        remaining -= count_tokens(body)
+        parts.append(header + body)
+    return "\n\n".join(parts)
+
+
+# -----------------------
+# Answer prompts
+# -----------------------
+# Static prefixes are byte-identical across calls so providers with
+# prefix/implicit caching can reuse them; per-request data goes last.
+ANSWER_SYSTEM_PROMPT = """You are a resume analysis assistant helping a candidate fill in job application forms.
+
+Rules:
+- Answer only from the resume context provided.
+- Never invent employers, dates, skills or credentials.
+- Keep answers concise and written in the first person, ready to paste into a form.
+- If the context does not contain the answer, say so."""
+
+SQL_SYSTEM_PROMPT = """You are a resume analysis assistant with access to SQL tools.
+
+Below is the database schema you MUST use:
+
+TABLE resumes (
+    user_id TEXT PRIMARY KEY,
+    name TEXT,
+    skills TEXT,
+    experience TEXT,
+    knowledge TEXT,
+    education TEXT,
+    projects TEXT,
+    certifications TEXT
+);
+
+You MUST:
+- Use SQL tools to answer the question.
+- Only use SQL queries based on the schema above.
+- Never guess column names or data.
+- Query only rows WHERE user_id = the given User ID unless asked otherwise.
+- If a question cannot be answered from the table, say so."""
+
+
+def build_answer_messages(
+    question: str,
+    resume: Dict[str, Optional[str]],
+    budget: int = ANSWER_PROMPT_TOKEN_BUDGET,
+    chunks: Optional[List[tuple]] = None,
+    job_context: Optional[str] = None
+) -> list:
+    """
+    Shared system prefix + only the resume context relevant to `question`:
+    retrieved (section, chunk) pairs when given, else whole ranked sections.
+    A precomputed job digest, if any, is placed ahead of the resume context.
+    """
+    fixed = count_tokens(ANSWER_SYSTEM_PROMPT) + count_tokens(question) + 16
+    job_block = ""
+    if job_context:
+        job_block = f"Job context:\n{truncate_to_tokens(job_context, budget // 4)}\n\n"
+        fixed += count_tokens(job_block)
+    if chunks:
+        sections = chunks
+    else:
+        sections = [(s, resume[s]) for s in select_resume_sections(question, resume)]
+    context = build_context(sections, budget - fixed)
+
+    return [
+        SystemMessage(content=ANSWER_SYSTEM_PROMPT),
+        HumanMessage(content=f"{job_block}Resume context:\n{context}\n\nQuestion: {question}"),
+    ]
+
+
+def build_sql_messages(user_id: str, question: str) -> list:
+    return [
+        SystemMessage(content=SQL_SYSTEM_PROMPT),
+        HumanMessage(content=f"User ID: {user_id}\nQuestion: {question}"),
+    ]
+
+
+# -----------------------
+# Extraction prompts
+# -----------------------
+def build_extraction_messages(static_prefix: str, input_text: str, budget: int = EXTRACTION_PROMPT_TOKEN_BUDGET) -> list:
+    """Shared extraction instructions + the posting text cut to the remaining budget."""
+    remaining = budget - count_tokens(static_prefix) - 8
+    return [
+        SystemMessage(content=static_prefix),
+        HumanMessage(content=f"INPUT TEXT:\n{truncate_to_tokens(input_text, remaining)}"),
+    ]
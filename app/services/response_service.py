@@ -0,0 +1,44 @@
+# services/response_service.py
+
+import os
+from typing import AsyncIterator, Iterable, Callable
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+# Rows serialized per chunk written to the socket
+STREAM_BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "50"))
+
+
+def dumps(obj) -> bytes:
+    """orjson with the options our payloads need (UUID/date are native)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def row_to_dict(row, fields: Iterable[str]) -> dict:
+    return {field: getattr(row, field) for field in fields}
+
+
+async def _json_array(rows: AsyncIterator, serialize: Callable) -> AsyncIterator[bytes]:
+    yield b"["
+    buffer, first = [], True
+    async for row in rows:
+        buffer.append(dumps(serialize(row)))
+        if len(buffer) >= STREAM_BATCH_ROWS:
+            yield (b"" if first else b",") + b",".join(buffer)
+            buffer, first = [], False
+    if buffer:
+        yield (b"" if first else b",") + b",".join(buffer)
+    yield b"]"
+
+
+def stream_json_array(rows: AsyncIterator, serialize: Callable) -> StreamingResponse:
+    """
+    Stream a JSON array row by row, so large lists are never materialized
+    as one Python list or one bytes blob.
+    """
+    return StreamingResponse(_json_array(rows, serialize), media_type="application/json")
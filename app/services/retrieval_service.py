@@ -0,0 +1,171 @@
+# services/retrieval_service.py
+
+import hashlib
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.prompt_service import RESUME_SECTIONS
+
+RETRIEVAL_DIM = int(os.getenv("RETRIEVAL_DIM", "512"))
+RETRIEVAL_CHUNK_WORDS = int(os.getenv("RETRIEVAL_CHUNK_WORDS", "60"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+RETRIEVAL_MAX_USERS = int(os.getenv("RETRIEVAL_MAX_USERS", "5000"))
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+_SENTENCE = re.compile(r"(?<=[.!?;\n])\s+")
+
+
+# -----------------------
+# CPU-only hashing embedder
+# -----------------------
+def embed(texts: List[str], dim: int = RETRIEVAL_DIM) -> np.ndarray:
+    """
+    Signed feature hashing of unigrams and bigrams, L2-normalised.
+    crc32 keeps the buckets stable across processes, unlike hash().
+    """
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _TOKEN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            h = zlib.crc32(feature.encode())
+            out[row, h % dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(out[row])
+        if norm:
+            out[row] /= norm
+    return out
+
+
+def chunk_text(text: str, max_words: int = RETRIEVAL_CHUNK_WORDS) -> List[str]:
+    """Pack whole sentences into chunks of at most ~max_words words."""
+    chunks, current, count = [], [], 0
+    for sentence in _SENTENCE.split(text.strip()):
+        words = len(sentence.split())
+        if current and count + words > max_words:
+            chunks.append(" ".join(current))
+            current, count = [], 0
+        current.append(sentence.strip())
+        count += words
+    if current:
+        chunks.append(" ".join(current))
+    return [c for c in chunks if c]
+
+
+# -----------------------
+# Per-user index
+# -----------------------
+class ResumeIndex:
+    """
+    Chunks of one user's resume(s) with float16 vectors in a single
+    contiguous array. Each resume is a `source`; re-indexing a source
+    only re-embeds that source's chunks.
+    """
+
+    def __init__(self, dim: int = RETRIEVAL_DIM):
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=np.float16)
+        self.chunks: List[Tuple[str, str, str]] = []  # (source, section, text)
+        self.fingerprints: Dict[str, str] = {}
+
+    def upsert(self, source: str, resume: Dict[str, Optional[str]]):
+        fingerprint = hashlib.sha1(
+            "\x00".join(resume.get(s) or "" for s in RESUME_SECTIONS).encode()
+        ).hexdigest()
+        if self.fingerprints.get(source) == fingerprint:
+            return
+
+        self.remove(source)
+        new_chunks = [
+            (source, section, chunk)
+            for section in RESUME_SECTIONS
+            if resume.get(section)
+            for chunk in chunk_text(resume[section])
+        ]
+        if new_chunks:
+            vectors = embed([f"{section} {chunk}" for _, section, chunk in new_chunks], self.dim)
+            self.vectors = np.vstack([self.vectors, vectors.astype(np.float16)])
+            self.chunks.extend(new_chunks)
+        self.fingerprints[source] = fingerprint
+
+    def remove(self, source: str):
+        self.fingerprints.pop(source, None)
+        keep = [i for i, c in enumerate(self.chunks) if c[0] != source]
+        if len(keep) != len(self.chunks):
+            self.vectors = self.vectors[keep]
+            self.chunks = [self.chunks[i] for i in keep]
+
+    def search(self, question: str, source: str, k: int = RETRIEVAL_TOP_K) -> List[Tuple[str, str]]:
+        """
+        Top-k (section, chunk) pairs of one source by cosine similarity.
+        A user may hold several resumes; answers never blend them.
+        """
+        rows = np.fromiter(
+            (i for i, c in enumerate(self.chunks) if c[0] == source), dtype=np.intp
+        )
+        if not len(rows):
+            return []
+        scores = self.vectors[rows].astype(np.float32) @ embed([question], self.dim)[0]
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.chunks[rows[i]][1], self.chunks[rows[i]][2]) for i in top]
+
+    @property
+    def nbytes(self) -> int:
+        return self.vectors.nbytes
+
+
+class IndexRegistry:
+    """
+    LRU-bounded map of user_id -> ResumeIndex, safe across threadpool workers.
+    Keys are `users.id`; sources are `resume_source(resume.id)`.
+    """
+
+    def __init__(self, max_users: int = RETRIEVAL_MAX_USERS):
+        self.max_users = max_users
+        self._indexes: "OrderedDict[str, ResumeIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, user_id: str) -> ResumeIndex:
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = self._indexes[user_id] = ResumeIndex()
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(user_id)
+        return index
+
+    def upsert(self, user_id, source: str, resume: Dict[str, Optional[str]]) -> ResumeIndex:
+        with self._lock:
+            index = self._get(str(user_id))
+            index.upsert(source, resume)
+            return index
+
+    def remove(self, user_id, source: str):
+        with self._lock:
+            index = self._indexes.get(str(user_id))
+            if index is not None:
+                index.remove(source)
+
+    def search(self, user_id, source: str, question: str, k: int = RETRIEVAL_TOP_K) -> List[Tuple[str, str]]:
+        with self._lock:
+            index = self._indexes.get(str(user_id))
+            return index.search(question, source, k) if index is not None else []
+
+
+resume_indexes = IndexRegistry()
+
+
+def resume_source(resume_id: int) -> str:
+    return f"resume:{resume_id}"
+
+
+def resume_fields(resume) -> Dict[str, Optional[str]]:
+    """Section dict from a Resume ORM row."""
+    return {section: getattr(resume, section) for section in RESUME_SECTIONS}
@@ -0,0 +1,182 @@
+# services/scheduler_service.py
+
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from prometheus_client import Gauge, Histogram
+
+# Limits are per worker process; the provider sees WEB_CONCURRENCY times these
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_PER_USER = int(os.getenv("LLM_MAX_PER_USER", "4"))
+# Batch work never takes more than this many global slots, so interactive
+# autofill always has headroom
+LLM_BATCH_MAX_CONCURRENCY = int(os.getenv("LLM_BATCH_MAX_CONCURRENCY", "4"))
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+QUEUE_WAIT = Histogram(
+    "applyr_llm_queue_wait_seconds",
+    "Time LLM tasks spend queued in the fair-share scheduler",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+QUEUE_DEPTH = Gauge(
+    "applyr_llm_queue_depth",
+    "LLM tasks waiting in the fair-share scheduler",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+IN_FLIGHT = Gauge(
+    "applyr_llm_in_flight",
+    "LLM tasks currently running",
+    ["priority"],
+    multiprocess_mode="livesum",
+)
+
+T = TypeVar("T")
+
+
+class FairScheduler:
+    """
+    Deficit round-robin over per-user queues for LLM-bound coroutines.
+
+    Every user with pending work sits on a ring per priority class. Each
+    visit tops the user's deficit up by their weight and dispatches one
+    task per unit of deficit, so a user with 200 queued questions gets the
+    same share of slots as a user with one. Interactive work is always
+    served before batch work.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_per_user: int = LLM_MAX_PER_USER,
+        max_batch: int = LLM_BATCH_MAX_CONCURRENCY
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_user = max_per_user
+        self.max_batch = max_batch
+
+        self._queues: Dict[str, Dict[str, deque]] = {p: {} for p in PRIORITIES}
+        self._rings: Dict[str, deque] = {p: deque() for p in PRIORITIES}
+        self._deficit: Dict[str, Dict[str, int]] = {p: defaultdict(int) for p in PRIORITIES}
+        self._weights: Dict[str, int] = {}
+        self._running_users: Dict[str, int] = defaultdict(int)
+        self._running: Dict[str, int] = {p: 0 for p in PRIORITIES}
+
+    def set_weight(self, user_id, weight: int):
+        self._weights[str(user_id)] = max(1, int(weight))
+
+    async def run(
+        self,
+        user_id,
+        coro_fn: Callable[[], Awaitable[T]],
+        priority: str = INTERACTIVE
+    ) -> T:
+        """Wait for a fair-share slot, then await `coro_fn()`."""
+        user = str(user_id)
+        grant = asyncio.get_running_loop().create_future()
+
+        queue = self._queues[priority].get(user)
+        if queue is None:
+            queue = self._queues[priority][user] = deque()
+            self._rings[priority].append(user)
+        queue.append((grant, time.perf_counter()))
+        QUEUE_DEPTH.labels(priority=priority).inc()
+
+        self._dispatch()
+        try:
+            await grant
+        except asyncio.CancelledError:
+            # Slot was granted in the same tick we were cancelled
+            if grant.done() and not grant.cancelled():
+                self._release(user, priority)
+            raise
+
+        try:
+            return await coro_fn()
+        finally:
+            self._release(user, priority)
+
+    # -----------------------
+    # Internals
+    # -----------------------
+    def _release(self, user: str, priority: str):
+        self._running[priority] -= 1
+        self._running_users[user] -= 1
+        if not self._running_users[user]:
+            del self._running_users[user]
+        IN_FLIGHT.labels(priority=priority).dec()
+        self._dispatch()
+
+    def _has_capacity(self, priority: str) -> bool:
+        if sum(self._running.values()) >= self.max_concurrency:
+            return False
+        return priority != BATCH or self._running[BATCH] < self.max_batch
+
+    def _dispatch(self):
+        for priority in PRIORITIES:
+            while self._has_capacity(priority):
+                if not self._grant_next(priority):
+                    break
+
+    def _grant_next(self, priority: str) -> bool:
+        ring = self._rings[priority]
+        deficit = self._deficit[priority]
+
+        for _ in range(len(ring)):
+            if not ring:
+                break
+            user = ring[0]
+            queue = self._queues[priority][user]
+
+            # Drop waiters that were cancelled (e.g. request timeout)
+            while queue and queue[0][0].done():
+                queue.popleft()
+                QUEUE_DEPTH.labels(priority=priority).dec()
+            if not queue:
+                self._retire(priority, user)
+                continue
+
+            if self._running_users.get(user, 0) >= self.max_per_user:
+                ring.rotate(-1)
+                continue
+
+            if deficit[user] < 1:
+                deficit[user] += self._weights.get(user, 1)
+            deficit[user] -= 1
+
+            grant, enqueued_at = queue.popleft()
+            QUEUE_DEPTH.labels(priority=priority).dec()
+            QUEUE_WAIT.labels(priority=priority).observe(time.perf_counter() - enqueued_at)
+
+            self._running[priority] += 1
+            self._running_users[user] += 1
+            IN_FLIGHT.labels(priority=priority).inc()
+            grant.set_result(None)
+
+            if not queue:
+                self._retire(priority, user)
+            elif deficit[user] < 1:
+                ring.rotate(-1)
+            return True
+
+        return False
+
+    def _retire(self, priority: str, user: str):
+        """Take a user with no pending work off the ring."""
+        ring = self._rings[priority]
+        if ring and ring[0] == user:
+            ring.popleft()
+        else:
+            ring.remove(user)
+        del self._queues[priority][user]
+        self._deficit[priority].pop(user, None)
+
+
+llm_scheduler = FairScheduler()
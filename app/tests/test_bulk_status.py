@@ -0,0 +1,123 @@
+# tests/test_bulk_status.py
+"""
+Bulk status transitions against PostgreSQL (UPDATE ... FROM (VALUES ...)
+does not run on SQLite). Set TEST_DATABASE_URL to a server the tests may
+create and drop a scratch database on, e.g.
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/postgres python -m pytest tests
+"""
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db import explain_check
+from db.models import Users, Resume
+from models.applications import Application
+from models.job_descriptions import JobDescription
+from schemas.applications import StatusTransition
+from services.application_service import bulk_transition_status
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = [
+    pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL (PostgreSQL) not set"),
+    pytest.mark.asyncio,
+]
+
+DRAFT, DRAFT_NO_RESUME, APPLIED, APPLIED_STALE, OTHER_USERS = (uuid.uuid4() for _ in range(5))
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    """Scratch database migrated to head, dropped afterwards."""
+    server = make_url(TEST_DATABASE_URL)
+    name = f"applyr_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(server, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.execute(text(f'CREATE DATABASE "{name}"'))
+
+    url = server.set(database=name)
+    try:
+        explain_check.migrate(url.render_as_string(hide_password=False))
+        yield url
+    finally:
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE "{name}" WITH (FORCE)'))
+        admin.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(database_url):
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE applications, job_descriptions, resumes, users CASCADE"))
+        conn.execute(insert(Users), [
+            {"id": 1, "username": "owner", "password": "x", "name": "Owner", "mail": "owner@example.com"},
+            {"id": 2, "username": "other", "password": "x", "name": "Other", "mail": "other@example.com"},
+        ])
+        conn.execute(insert(Resume), [{"id": 10, "user_id": 1}, {"id": 20, "user_id": 2}])
+        conn.execute(insert(JobDescription), [{"content_hash": "0" * 64, "body": b"x", "size": 1}])
+        conn.execute(insert(Application), [
+            {"id": app_id, "user_id": user_id, "resume_id": resume_id, "status": status,
+             "job_role": "Engineer", "company_name": "Acme", "job_description_hash": "0" * 64}
+            for app_id, user_id, resume_id, status in [
+                (DRAFT, 1, None, "draft"),
+                (DRAFT_NO_RESUME, 1, None, "draft"),
+                (APPLIED, 1, 10, "applied"),
+                (APPLIED_STALE, 1, 10, "applied"),
+                (OTHER_USERS, 2, 20, "draft"),
+            ]
+        ])
+    engine.dispose()
+
+    async_engine = create_async_engine(database_url.set(drivername="postgresql+asyncpg"))
+    async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+        yield session
+    await async_engine.dispose()
+
+
+async def test_transition_outcomes(db):
+    missing = uuid.uuid4()
+    results = await bulk_transition_status(db, 1, [
+        StatusTransition(id=DRAFT, status="applied", version=1, resume_id=10),
+        StatusTransition(id=DRAFT_NO_RESUME, status="applied", version=1),
+        StatusTransition(id=APPLIED, status="screened", version=1),
+        StatusTransition(id=APPLIED_STALE, status="screened", version=7),
+        StatusTransition(id=OTHER_USERS, status="applied", version=1),
+        StatusTransition(id=missing, status="applied", version=1),
+    ])
+    outcomes = {r.id: r for r in results}
+
+    assert outcomes[DRAFT].ok and outcomes[DRAFT].status == "applied"
+    assert (outcomes[DRAFT].version, outcomes[DRAFT].resume_id) == (2, 10)
+    assert outcomes[DRAFT_NO_RESUME].error == "resume_required"
+    assert outcomes[APPLIED].ok and outcomes[APPLIED].status == "screened"
+    assert outcomes[APPLIED_STALE].error == "version_conflict"
+    assert outcomes[OTHER_USERS].error == "not_found"
+    assert outcomes[missing].error == "not_found"
+
+    rows = dict((await db.execute(select(Application.id, Application.status))).all())
+    assert rows[DRAFT] == "applied"
+    assert rows[DRAFT_NO_RESUME] == "draft"
+    assert rows[OTHER_USERS] == "draft"
+
+
+async def test_rejected_before_the_update(db):
+    results = await bulk_transition_status(db, 1, [
+        StatusTransition(id=DRAFT, status="applied", version=1, resume_id=20),
+        StatusTransition(id=DRAFT_NO_RESUME, status="archived", version=1),
+        StatusTransition(id=APPLIED, status="selected", version=1),
+    ])
+
+    assert [r.error for r in results] == [
+        "resume_not_found",
+        "unknown_status:archived",
+        "invalid_transition:applied->selected",
+    ]
+    rows = dict((await db.execute(select(Application.id, Application.resume_id))).all())
+    assert rows[DRAFT] is None
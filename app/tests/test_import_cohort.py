@@ -0,0 +1,47 @@
+# tests/test_import_cohort.py
+from sqlalchemy import create_engine, insert, select
+
+from db.database import Base
+from db.import_cohort import import_cohort
+from db.models import Users, Resume
+
+COHORT_CSV = """username,password,name,mail,job_role,skills
+alice,secret123,Alice,alice@example.com,Backend Engineer,"Python, SQL"
+bob,secret123,Bob,bob@example.com,,
+alice,secret123,Alice Again,alice2@example.com,,
+carol,secret123,Carol,not-an-email,,
+dave,secret123,Dave,dave@example.com,,
+ed,,Ed,ed@example.com,,
+"""
+
+
+def test_import_cohort_from_csv(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cohort.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Users), [
+            {"username": "dave", "password": "x", "name": "Dave", "mail": "dave@elsewhere.com"}
+        ])
+
+    path = tmp_path / "cohort.csv"
+    path.write_text(COHORT_CSV)
+
+    summary = import_cohort(str(path), engine, workers=1)
+
+    assert summary["users_created"] == 2
+    assert summary["resumes_created"] == 1
+
+    errors = {e["row"]: e["error"] for e in summary["errors"]}
+    assert errors[3] == "Duplicate username in file"
+    assert errors[4].startswith("mail: value is not a valid email address")
+    assert errors[5] == "Username already registered"
+    assert "username: String should have at least 3 characters" in errors[6]
+    assert "password: Input should be a valid string" in errors[6]
+    assert sorted(errors) == [3, 4, 5, 6]
+
+    with engine.connect() as conn:
+        users = dict(conn.execute(select(Users.username, Users.job_role)).all())
+        resumes = conn.execute(select(Users.username, Resume.skills).join(Resume, Resume.user_id == Users.id)).all()
+
+    assert users == {"dave": None, "alice": "Backend Engineer", "bob": None}
+    assert resumes == [("alice", "Python, SQL")]
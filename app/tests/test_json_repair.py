@@ -0,0 +1,91 @@
+# tests/test_json_repair.py
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from schemas.applications import ApplicationExtract
+from services.json_repair_service import RepairError, parse_date, parse_structured, repair_json_text
+
+
+def test_clean_output_parses_strictly():
+    result = parse_structured(
+        '{"job_role": "Engineer", "job_description": "Build APIs", "company_name": "Acme",'
+        ' "company_description": null, "final_date": "2025-03-01"}',
+        ApplicationExtract,
+    )
+    assert result.final_date == date(2025, 3, 1)
+
+
+def test_strips_code_fences_and_prose():
+    text = 'Sure! Here it is:\n```json\n{"job_role": "Engineer", "note": "a {brace}"}\n```\nHope that helps.'
+    assert repair_json_text(text) == {"job_role": "Engineer", "note": "a {brace}"}
+
+
+def test_closes_truncated_object():
+    assert repair_json_text('{"job_role": "Engineer", "company_name": "Ac') == {
+        "job_role": "Engineer",
+        "company_name": "Ac",
+    }
+
+
+def test_removes_trailing_commas():
+    assert repair_json_text('{"skills": ["a", "b",], "role": "x",}') == {"skills": ["a", "b"], "role": "x"}
+
+
+def test_rewrites_python_literals():
+    assert repair_json_text('{"remote": True, "visa": False, "salary": None}') == {
+        "remote": True,
+        "visa": False,
+        "salary": None,
+    }
+
+
+def test_string_values_are_never_rewritten():
+    data = repair_json_text(
+        '{"culture": "True ownership, False starts, None of the fluff", '
+        '"apply": "Reply with a, ] please", "note": "say \\"True\\", }",}'
+    )
+    assert data == {
+        "culture": "True ownership, False starts, None of the fluff",
+        "apply": "Reply with a, ] please",
+        "note": 'say "True", }',
+    }
+
+
+def test_null_like_strings_and_missing_optionals():
+    result = parse_structured(
+        '{"job_role": "Engineer", "job_description": "Build APIs", "company_name": "Acme",'
+        ' "company_description": "N/A",}',
+        ApplicationExtract,
+    )
+    assert result.company_description is None
+    assert result.final_date is None
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("2025-03-01", date(2025, 3, 1)),
+    ("01/03/2025", date(2025, 3, 1)),
+    ("1st March, 2025", date(2025, 3, 1)),
+    ("March 1 2025", date(2025, 3, 1)),
+    ("not mentioned", None),
+    ("sometime soon", None),
+])
+def test_parse_date(raw, expected):
+    assert parse_date(raw) == expected
+
+
+def test_repaired_date_is_coerced():
+    result = parse_structured(
+        '```json\n{"job_role": "Engineer", "job_description": "x", "company_name": "Acme",'
+        ' "final_date": "15 Jan 2025"}\n```',
+        ApplicationExtract,
+    )
+    assert result.final_date == date(2025, 1, 15)
+
+
+def test_unrepairable_output_raises():
+    with pytest.raises(RepairError):
+        parse_structured("I could not find a job posting.", ApplicationExtract)
+    with pytest.raises(ValidationError):
+        parse_structured('{"job_role": "Engineer"}', ApplicationExtract)
@@ -0,0 +1,100 @@
+# tests/test_posting_cleaner.py
+from services.posting_cleaner_service import clean_posting
+
+BOARD_PAGE = """
+<html>
+<head><title>Senior Backend Engineer - Globex Corp | JobBoard</title><style>.x{color:red}</style></head>
+<body>
+  <header class="site-header"><a href="/">JobBoard</a><a href="/login">Sign in</a></header>
+  <nav class="top-nav"><a>Jobs</a><a>Companies</a><a>Salaries</a></nav>
+  <div id="cookie-banner">We use cookies to improve your experience. <button>Accept all</button></div>
+  <main>
+    <article class="posting">
+      <header>
+        <h1>Senior Backend Engineer</h1>
+        <p>Globex Corp</p>
+        <p>Bengaluru, India (Hybrid)</p>
+      </header>
+      <div class="toolbar"><span>Apply now</span> | <span>Save job</span></div>
+      <div class="job-description shared-content">
+        <h2>About the role</h2>
+        <p>You will design and operate the services behind our analytics platform.</p>
+        <h2>Responsibilities</h2>
+        <ul>
+          <li>Build log ingestion pipelines that handle billions of events a day.</li>
+          <li>Own our sign in and sign up flows, including SSO and MFA.</li>
+          <li>Mentor engineers and review designs across the team.</li>
+        </ul>
+        <h2>Requirements</h2>
+        <ul>
+          <li>5+ years of experience with Python or Go in production.</li>
+          <li>Strong PostgreSQL skills and experience with Kafka.</li>
+        </ul>
+        <p>Apply by 30 June 2025.</p>
+      </div>
+    </article>
+    <section class="similar-jobs">
+      <h3>Similar jobs</h3>
+      <ul><li>Backend Engineer - Initech</li><li>Platform Engineer - Umbrella</li></ul>
+    </section>
+  </main>
+  <footer><p>© 2025 JobBoard. All rights reserved.</p><a>Privacy Policy</a></footer>
+</body>
+</html>
+"""
+
+
+def test_keeps_the_posting_from_a_board_page():
+    text = clean_posting(BOARD_PAGE).text
+
+    for kept in [
+        "Senior Backend Engineer",
+        "Globex Corp",
+        "Bengaluru, India (Hybrid)",
+        "You will design and operate the services",
+        "Build log ingestion pipelines",
+        "Own our sign in and sign up flows",
+        "Strong PostgreSQL skills",
+        "Apply by 30 June 2025.",
+    ]:
+        assert kept in text
+
+
+def test_drops_page_chrome():
+    text = clean_posting(BOARD_PAGE).text
+
+    for dropped in [
+        "JobBoard",
+        "Companies",
+        "We use cookies",
+        "Apply now",
+        "Similar jobs",
+        "Initech",
+        "All rights reserved",
+        "Privacy Policy",
+        ".x{color:red}",
+    ]:
+        assert dropped not in text
+
+
+def test_class_names_match_whole_words_only():
+    page = (
+        '<div class="job-description shared-content">'
+        "<p>Senior Data Engineer at Acme. You will build and own our batch and streaming "
+        "pipelines, with 4+ years of experience in Spark and strong SQL skills required.</p>"
+        "</div>"
+    )
+    assert "Senior Data Engineer at Acme" in clean_posting(page).text
+
+
+def test_falls_back_to_raw_input_when_nothing_survives():
+    page = '<div class="sidebar"><p>' + "Staff engineer role building payments infrastructure. " * 5 + "</p></div>"
+    result = clean_posting(page)
+
+    assert "Staff engineer role building payments infrastructure." in result.text
+    assert result.cleaned_chars > 0
+
+
+def test_plain_text_passes_through():
+    posting = "Backend Engineer\nAcme\nRequirements:\n- Python\n- 3+ years of experience building APIs"
+    assert clean_posting(posting).text == posting
@@ -0,0 +1,14 @@
+# tests/test_query_plans.py
+"""Fail CI when a schema change makes a hot query scan a table."""
+import os
+
+from db import explain_check
+
+
+def test_hot_queries_use_indexes(tmp_path, capsys):
+    url = f"sqlite:///{os.path.join(tmp_path, 'explain.db')}"
+
+    failures = explain_check.run(url)
+
+    report = capsys.readouterr().out
+    assert failures == 0, report
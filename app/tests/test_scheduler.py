@@ -0,0 +1,128 @@
+# tests/test_scheduler.py
+import asyncio
+
+import pytest
+
+from services.scheduler_service import BATCH, INTERACTIVE, FairScheduler
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _settle():
+    """Let queued tasks reach their await points."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _hold(scheduler, user="holder"):
+    """Occupy one slot until the returned event is set."""
+    release = asyncio.Event()
+    task = asyncio.create_task(scheduler.run(user, release.wait))
+    await _settle()
+    return release, task
+
+
+def _recorder(order, label):
+    async def work():
+        order.append(label)
+        await asyncio.sleep(0)
+    return work
+
+
+async def test_light_user_is_served_ahead_of_heavy_backlog():
+    scheduler = FairScheduler(max_concurrency=1, max_per_user=1, max_batch=1)
+    release, holder = await _hold(scheduler)
+
+    order = []
+    tasks = [asyncio.create_task(scheduler.run("heavy", _recorder(order, f"heavy{i}"))) for i in range(5)]
+    tasks.append(asyncio.create_task(scheduler.run("light", _recorder(order, "light"))))
+    await _settle()
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+
+    assert order.index("light") == 1
+
+
+async def test_batch_waits_behind_interactive():
+    scheduler = FairScheduler(max_concurrency=1, max_per_user=4, max_batch=1)
+    release, holder = await _hold(scheduler)
+
+    order = []
+    batch = asyncio.create_task(scheduler.run("a", _recorder(order, "batch"), BATCH))
+    await _settle()
+    interactive = asyncio.create_task(scheduler.run("b", _recorder(order, "interactive"), INTERACTIVE))
+    await _settle()
+
+    release.set()
+    await asyncio.gather(holder, batch, interactive)
+
+    assert order == ["interactive", "batch"]
+
+
+async def test_batch_never_takes_more_than_its_cap():
+    scheduler = FairScheduler(max_concurrency=4, max_per_user=4, max_batch=1)
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(scheduler.run(f"u{i}", release.wait, BATCH)) for i in range(3)]
+    await _settle()
+
+    assert scheduler._running[BATCH] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_weights_scale_the_share():
+    scheduler = FairScheduler(max_concurrency=1, max_per_user=4, max_batch=1)
+    scheduler.set_weight("a", 3)
+    release, holder = await _hold(scheduler)
+
+    order = []
+    tasks = [asyncio.create_task(scheduler.run("a", _recorder(order, "a"))) for _ in range(6)]
+    tasks += [asyncio.create_task(scheduler.run("b", _recorder(order, "b"))) for _ in range(6)]
+    await _settle()
+
+    release.set()
+    await asyncio.gather(holder, *tasks)
+
+    assert order[:8] == ["a", "a", "a", "b", "a", "a", "a", "b"]
+
+
+async def test_per_user_cap_leaves_room_for_others():
+    scheduler = FairScheduler(max_concurrency=2, max_per_user=1, max_batch=1)
+    release = asyncio.Event()
+
+    first = asyncio.create_task(scheduler.run("a", release.wait))
+    second = asyncio.create_task(scheduler.run("a", release.wait))
+    other = asyncio.create_task(scheduler.run("b", release.wait))
+    await _settle()
+
+    assert scheduler._running_users == {"a": 1, "b": 1}
+    release.set()
+    await asyncio.gather(first, second, other)
+
+
+async def test_cancelled_waiter_and_runner_release_their_slots():
+    scheduler = FairScheduler(max_concurrency=1, max_per_user=4, max_batch=1)
+    release, holder = await _hold(scheduler)
+
+    # Cancelled while queued: never runs, never holds a slot
+    order = []
+    waiter = asyncio.create_task(scheduler.run("a", _recorder(order, "cancelled")))
+    await _settle()
+    waiter.cancel()
+
+    # Cancelled while running: its slot goes to the next task
+    release.set()
+    await holder
+    running = asyncio.create_task(scheduler.run("b", asyncio.Event().wait))
+    await _settle()
+    after = asyncio.create_task(scheduler.run("c", _recorder(order, "after")))
+    await _settle()
+    running.cancel()
+    await asyncio.gather(waiter, running, return_exceptions=True)
+    await after
+
+    assert order == ["after"]
+    assert sum(scheduler._running.values()) == 0
+    assert not scheduler._running_users